@@ -0,0 +1,8 @@
+-- Migration: 028_asset_upsert_index.sql
+-- UNIQUE(symbol, contract_address) does not cover rows with a NULL contract
+-- address (NULLs never conflict), so add a partial unique index that lets
+-- get_or_create_asset upsert native/non-contract assets with ON CONFLICT.
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_assets_symbol_no_contract
+    ON assets (symbol)
+    WHERE contract_address IS NULL;
@@ -0,0 +1,20 @@
+-- Migration: 029_latest_liqwid_apys_view.sql
+-- Latest Liqwid APY snapshot per asset, precomputed so dashboards do not
+-- re-run DISTINCT ON over the whole (ever-growing) liqwid_apy_snapshots table.
+-- Refreshed by APYQueries.refresh_latest_liqwid_apys() after each collection run.
+
+CREATE MATERIALIZED VIEW IF NOT EXISTS latest_liqwid_apys AS
+SELECT DISTINCT ON (asset_id)
+       snapshot_id, asset_id, market_id,
+       supply_apy, lq_supply_apy, total_supply_apy, borrow_apy,
+       total_supply, total_borrows, utilization_rate, available_liquidity,
+       total_supply_usd, total_borrows_usd, token_price_usd,
+       yield_type, timestamp
+FROM liqwid_apy_snapshots
+ORDER BY asset_id, timestamp DESC;
+
+-- Required for REFRESH MATERIALIZED VIEW CONCURRENTLY
+CREATE UNIQUE INDEX IF NOT EXISTS idx_latest_liqwid_apys_asset
+    ON latest_liqwid_apys (asset_id);
+
+COMMENT ON MATERIALIZED VIEW latest_liqwid_apys IS 'Most recent liqwid_apy_snapshots row per asset';
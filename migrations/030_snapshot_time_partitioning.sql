@@ -0,0 +1,38 @@
+-- Migration: 030_snapshot_time_partitioning.sql
+-- Time-range scans (history charts, "last N days" queries) over the
+-- append-only snapshot tables.
+--
+-- apr_snapshots is already chunked by day as a TimescaleDB hypertable (002).
+-- price_snapshots was left as a plain table (see the commented-out call in
+-- 004); convert it the same way when TimescaleDB is available so time-range
+-- queries only touch the matching chunks.
+
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'timescaledb') THEN
+        PERFORM create_hypertable(
+            'price_snapshots',
+            'timestamp',
+            chunk_time_interval => INTERVAL '1 day',
+            if_not_exists => TRUE,
+            migrate_data => TRUE
+        );
+        RAISE NOTICE 'Created hypertable for price_snapshots';
+    ELSE
+        RAISE NOTICE 'TimescaleDB not installed, using regular table';
+    END IF;
+EXCEPTION
+    WHEN others THEN
+        RAISE NOTICE 'Could not create hypertable: %', SQLERRM;
+END;
+$$;
+
+-- BRIN indexes: rows are inserted in timestamp order, so a block-range index
+-- prunes old blocks for window queries at a tiny fraction of a btree's size
+-- and write cost. liqwid_apy_snapshots cannot become a hypertable (its
+-- primary key does not include timestamp), so this is its range-pruning path.
+CREATE INDEX IF NOT EXISTS idx_liqwid_apy_timestamp_brin
+    ON liqwid_apy_snapshots USING BRIN (timestamp);
+
+CREATE INDEX IF NOT EXISTS idx_price_timestamp_brin
+    ON price_snapshots USING BRIN (timestamp);
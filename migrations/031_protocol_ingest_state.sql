@@ -0,0 +1,73 @@
+-- Migration: 031_protocol_ingest_state.sql
+-- Latest EST date with an apr_snapshots row, per protocol.
+-- The collectors ask "has this protocol been collected today?" every run;
+-- answering from this one-row-per-protocol table is a primary key lookup
+-- instead of a timestamp range scan over apr_snapshots.
+-- Maintained by triggers on apr_snapshots, so every writer (including psql)
+-- keeps it current. A missing row means "unknown": readers fall back to
+-- scanning apr_snapshots. After a TRUNCATE of apr_snapshots, empty this
+-- table too.
+
+CREATE TABLE IF NOT EXISTS protocol_ingest_state (
+    protocol_id INTEGER PRIMARY KEY REFERENCES protocols(protocol_id) ON DELETE CASCADE,
+    last_snapshot_date_est DATE NOT NULL
+);
+
+-- Backfill from existing snapshots
+INSERT INTO protocol_ingest_state (protocol_id, last_snapshot_date_est)
+SELECT protocol_id, MAX((timestamp AT TIME ZONE 'America/New_York')::date)
+FROM apr_snapshots
+GROUP BY protocol_id
+ON CONFLICT (protocol_id) DO UPDATE
+    SET last_snapshot_date_est = GREATEST(protocol_ingest_state.last_snapshot_date_est,
+                                          EXCLUDED.last_snapshot_date_est);
+
+COMMENT ON TABLE protocol_ingest_state IS 'Latest EST date with an APR snapshot, per protocol';
+
+-- Row-level rather than statement-level: TimescaleDB hypertables (002) do not
+-- support the transition tables a statement-level trigger would need to see
+-- the inserted rows. In the common case (a snapshot for a date already
+-- recorded) this is one primary key lookup and no write.
+CREATE OR REPLACE FUNCTION apr_snapshots_advance_ingest_state()
+RETURNS TRIGGER AS $$
+DECLARE
+    snapshot_date DATE := (NEW.timestamp AT TIME ZONE 'America/New_York')::date;
+BEGIN
+    UPDATE protocol_ingest_state
+    SET last_snapshot_date_est = snapshot_date
+    WHERE protocol_id = NEW.protocol_id AND last_snapshot_date_est < snapshot_date;
+
+    IF NOT FOUND AND NOT EXISTS (
+        SELECT 1 FROM protocol_ingest_state WHERE protocol_id = NEW.protocol_id
+    ) THEN
+        -- No state yet (new protocol, or dropped by a delete): rebuild it from
+        -- the table, which already includes NEW
+        INSERT INTO protocol_ingest_state (protocol_id, last_snapshot_date_est)
+        SELECT NEW.protocol_id, MAX((timestamp AT TIME ZONE 'America/New_York')::date)
+        FROM apr_snapshots
+        WHERE protocol_id = NEW.protocol_id
+        ON CONFLICT (protocol_id) DO UPDATE
+            SET last_snapshot_date_est = GREATEST(protocol_ingest_state.last_snapshot_date_est,
+                                                  EXCLUDED.last_snapshot_date_est);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Deleting or moving snapshots (e.g. removing a bad day to re-collect it)
+-- drops the protocol's state; the next insert rebuilds it
+CREATE OR REPLACE FUNCTION apr_snapshots_reset_ingest_state()
+RETURNS TRIGGER AS $$
+BEGIN
+    DELETE FROM protocol_ingest_state WHERE protocol_id = OLD.protocol_id;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS apr_snapshots_ingest_state_insert ON apr_snapshots;
+CREATE TRIGGER apr_snapshots_ingest_state_insert AFTER INSERT ON apr_snapshots
+    FOR EACH ROW EXECUTE FUNCTION apr_snapshots_advance_ingest_state();
+
+DROP TRIGGER IF EXISTS apr_snapshots_ingest_state_reset ON apr_snapshots;
+CREATE TRIGGER apr_snapshots_ingest_state_reset AFTER DELETE OR UPDATE OF protocol_id, timestamp ON apr_snapshots
+    FOR EACH ROW EXECUTE FUNCTION apr_snapshots_reset_ingest_state();
@@ -0,0 +1,8 @@
+-- Migration: 032_liqwid_est_date_index.sql
+-- Expression index on the EST calendar date of each Liqwid snapshot.
+-- APYQueries.has_liqwid_snapshots_for_date_est filters on exactly this
+-- expression, so the daily "already collected?" check is an index lookup
+-- instead of Python-side day-boundary math plus a timestamp range scan.
+
+CREATE INDEX IF NOT EXISTS idx_liqwid_apy_est_date
+    ON liqwid_apy_snapshots (((timestamp AT TIME ZONE 'America/New_York')::date));
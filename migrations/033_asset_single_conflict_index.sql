@@ -0,0 +1,14 @@
+-- Migration: 033_asset_single_conflict_index.sql
+-- Unique index on (symbol, COALESCE(contract_address, '')) so a single
+-- INSERT ... ON CONFLICT statement upserts assets with or without a contract
+-- address. Before this, get_or_create_asset needed a different conflict
+-- target (and so a different prepared statement) for each case: the
+-- UNIQUE(symbol, contract_address) constraint never fires for NULL addresses.
+-- The coalesced index also serves symbol lookups of contract-less assets,
+-- so the partial index from migration 028 is dropped rather than maintained
+-- on every asset write.
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_assets_symbol_contract_coalesced
+    ON assets (symbol, (COALESCE(contract_address, '')));
+
+DROP INDEX IF EXISTS idx_assets_symbol_no_contract;
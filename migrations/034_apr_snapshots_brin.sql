@@ -0,0 +1,10 @@
+-- Migration: 034_apr_snapshots_brin.sql
+-- BRIN index on apr_snapshots.timestamp for the "last N days" history queries.
+-- With TimescaleDB, chunk exclusion already prunes old data; without it
+-- (setup_database(create_timescaledb=False), or when 002 failed for lack of
+-- superuser) apr_snapshots is a plain append-only table and only the large
+-- btree on timestamp could help. Snapshots are written once per day, so a
+-- small pages_per_range keeps each range close to one collection run.
+
+CREATE INDEX IF NOT EXISTS idx_apr_snapshots_timestamp_brin
+    ON apr_snapshots USING BRIN (timestamp) WITH (pages_per_range = 32);
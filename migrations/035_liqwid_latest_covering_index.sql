@@ -0,0 +1,21 @@
+-- Migration: 035_liqwid_latest_covering_index.sql
+-- Covering index for APYQueries.get_latest_liqwid_apy (newest row for one
+-- asset): every selected column is in the index, so the lookup is an
+-- index-only scan with no heap fetch once the visibility map is current.
+-- Keep the INCLUDE list in sync with _LIQWID_HISTORY_COLUMNS in
+-- src/database/queries.py when snapshot columns are added.
+--
+-- VACUUM cannot run inside the migration transaction; autovacuum sets the
+-- visibility map for this append-only table (or run VACUUM ANALYZE
+-- liqwid_apy_snapshots once by hand after applying).
+
+CREATE INDEX IF NOT EXISTS idx_liqwid_apy_asset_latest_covering
+    ON liqwid_apy_snapshots (asset_id, timestamp DESC)
+    INCLUDE (snapshot_id, market_id, supply_apy, lq_supply_apy, total_supply_apy,
+             borrow_apy, total_supply, total_borrows, utilization_rate,
+             available_liquidity, yield_type);
+
+-- Superseded by the covering index (same key columns)
+DROP INDEX IF EXISTS idx_liqwid_apy_asset;
+
+ANALYZE liqwid_apy_snapshots;
@@ -0,0 +1,8 @@
+-- Migration: 036_wallet_challenges_unlogged.sql
+-- wallet_challenges holds one-time login nonces that expire after 5 minutes
+-- and are written and deleted on every wallet sign-in. Nothing in it needs
+-- to survive a crash (an interrupted login just requests a new challenge),
+-- so skip WAL for it. Unlogged tables are truncated after a crash and are
+-- not replicated to standbys, which is fine for this data.
+
+ALTER TABLE wallet_challenges SET UNLOGGED;
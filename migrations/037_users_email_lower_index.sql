@@ -0,0 +1,11 @@
+-- Migration: 037_users_email_lower_index.sql
+-- Email lookups compare lower(email), so they stay case-insensitive no
+-- matter how an address was typed, and this unique index keeps two accounts
+-- from differing only by case. It replaces idx_users_email, which
+-- duplicated the index behind the UNIQUE (email) constraint.
+-- Fails if existing rows already collide case-insensitively; merge those
+-- accounts first.
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_users_email_lower ON users (lower(email));
+
+DROP INDEX IF EXISTS idx_users_email;
@@ -0,0 +1,16 @@
+-- Migration: 038_wallet_challenges_unique_address.sql
+-- One outstanding challenge per wallet address. create_wallet_challenge
+-- upserts on this key, so a new challenge overwrites the old row in place,
+-- and two concurrent challenge requests can no longer leave two rows.
+-- The unique index replaces the plain idx_wallet_challenges_address.
+
+-- Keep only the newest challenge for any address that has several
+DELETE FROM wallet_challenges w
+USING wallet_challenges newer
+WHERE newer.wallet_address = w.wallet_address
+  AND newer.challenge_id > w.challenge_id;
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_wallet_challenges_address_unique
+    ON wallet_challenges(wallet_address);
+
+DROP INDEX IF EXISTS idx_wallet_challenges_address;
@@ -17,7 +17,8 @@ Cron example (daily at midnight UTC):
 import sys
 import logging
 from pathlib import Path
-from datetime import datetime
+from datetime import datetime, timezone
+from dataclasses import replace
 from decimal import Decimal
 from typing import Optional, List, Dict
 from zoneinfo import ZoneInfo
@@ -151,7 +152,7 @@ def collect_liqwid_apy(cardano_adapter: CardanoChainAdapter, db_queries: APYQuer
     # Fetch token prices for USD conversion
     prices = fetch_token_prices()
 
-    timestamp = datetime.utcnow()
+    timestamp = datetime.now(timezone.utc)
     snapshots = []
 
     # Get all supported markets
@@ -251,8 +252,7 @@ def collect_liqwid_apy(cardano_adapter: CardanoChainAdapter, db_queries: APYQuer
             
             # Insert snapshot
             snapshot_id = db_queries.insert_liqwid_apy_snapshot(snapshot)
-            snapshot.snapshot_id = snapshot_id
-            snapshots.append(snapshot)
+            snapshots.append(replace(snapshot, snapshot_id=snapshot_id))
             
             supply_str = f"{supply_apy:.4f}%" if supply_apy else "N/A"
             lq_str = f"+{lq_supply_apy:.4f}% LQ" if lq_supply_apy and lq_supply_apy > 0 else ""
@@ -315,6 +315,8 @@ def main():
 
         # Collect APY data
         snapshots = collect_liqwid_apy(cardano_adapter, db_queries)
+        if snapshots:
+            db_queries.refresh_latest_liqwid_apys()
         
         # Summary
         logger.info("=" * 60)
@@ -25,7 +25,7 @@ Cron example (10:00 AM server time):
 
 import logging
 import sys
-from datetime import datetime
+from datetime import datetime, timezone
 from decimal import Decimal
 from pathlib import Path
 from zoneinfo import ZoneInfo
@@ -106,7 +106,7 @@ def collect_and_store_minswap():
 
         # Get all configured assets and fetch their metrics
         assets = minswap_adapter.get_supported_assets()
-        timestamp = datetime.utcnow()
+        timestamp = datetime.now(timezone.utc)
 
         inserted = 0
         pools_above_threshold = 0
@@ -144,7 +144,8 @@ def collect_and_store_minswap():
                     pool_identifier=metrics.pool_id,
                     pair_name=asset,
                     version=None,  # Minswap doesn't have pool versions
-                    above_threshold=above_threshold
+                    above_threshold=above_threshold,
+                    today=today_est
                 )
 
             if above_threshold:
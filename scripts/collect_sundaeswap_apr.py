@@ -30,7 +30,7 @@ Cron example (10:05 AM server time):
 
 import logging
 import sys
-from datetime import datetime
+from datetime import datetime, timezone
 from decimal import Decimal
 from pathlib import Path
 from zoneinfo import ZoneInfo
@@ -119,7 +119,7 @@ def collect_and_store_sundaeswap():
 
         # Get all pools: popular + tracked pools not in popular list
         pools = sundae_adapter.get_all_pools(tracked_pool_ids=tracked_pool_ids)
-        timestamp = datetime.utcnow()
+        timestamp = datetime.now(timezone.utc)
 
         logger.info("Found %d SundaeSwap pools total (popular + tracked)", len(pools))
 
@@ -167,7 +167,8 @@ def collect_and_store_sundaeswap():
                 pool_identifier=pool.pool_id,
                 pair_name=pool.pair,
                 version=pool.version,
-                above_threshold=above_threshold
+                above_threshold=above_threshold,
+                today=today_est
             )
 
             if above_threshold:
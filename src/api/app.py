@@ -11,6 +11,7 @@ from flask import Flask, jsonify, render_template, request, redirect
 from flask_cors import CORS
 from flask_login import current_user, login_required
 from datetime import datetime, timedelta
+from psycopg.rows import dict_row
 from src.database.connection import DatabaseConnection
 from src.database.queries import DatabaseQueries, APYQueries
 from src.database.user_queries import UserQueries, CURRENT_TOS_VERSION
@@ -44,13 +45,18 @@ login_manager.init_app(app)
 mail.init_app(app)
 
 # Database connection
-db = DatabaseConnection()
+db = DatabaseConnection(application_name='defitracker-api')
 queries = DatabaseQueries(db)
 apy_queries = APYQueries(db)
-user_queries = UserQueries(db)
+
+# Login, session and saved-chart queries get their own pool so slow chart
+# queries cannot starve authentication, with a short statement timeout since
+# every one of them is a single-row lookup or write
+auth_db = DatabaseConnection(application_name='defitracker-auth', statement_timeout_ms=2000)
+user_queries = UserQueries(auth_db)
 
 # Initialize auth module with database
-init_auth(db)
+init_auth(auth_db)
 
 # Register blueprints
 app.register_blueprint(auth_bp)
@@ -157,23 +163,22 @@ def normalize_pair(symbol: str) -> str:
 def api_get_chains():
     """Get list of all chains"""
     chains = queries.get_all_blockchains()
-    return jsonify(chains)
+    return jsonify([chain.to_dict() for chain in chains])
 
 @app.route('/api/<chain>/protocols')
 def api_get_protocols(chain):
     """Get protocols for a specific chain"""
     conn = db.get_connection()
     try:
-        with conn.cursor() as cur:
+        with conn.cursor(row_factory=dict_row) as cur:
             cur.execute("""
-                SELECT p.protocol_id, p.name, p.api_url
+                SELECT p.protocol_id AS id, p.name, p.api_url
                 FROM protocols p
                 JOIN blockchains b ON p.blockchain_id = b.blockchain_id
                 WHERE b.name = %s
                 ORDER BY p.name
             """, (chain,))
-            protocols = [{'id': r[0], 'name': r[1], 'api_url': r[2]} 
-                        for r in cur.fetchall()]
+            protocols = cur.fetchall()
         return jsonify(protocols)
     finally:
         db.return_connection(conn)
@@ -193,7 +198,7 @@ def api_get_assets(chain, protocol):
     
     conn = db.get_connection()
     try:
-        with conn.cursor() as cur:
+        with conn.cursor(row_factory=dict_row) as cur:
             # Other protocols use apr_snapshots
             query = """
                 SELECT DISTINCT a.symbol, a.name, s.yield_type
@@ -209,7 +214,7 @@ def api_get_assets(chain, protocol):
                 params.append(yield_type)
             query += " ORDER BY a.symbol"
             cur.execute(query, params)
-            assets = [{'symbol': r[0], 'name': r[1], 'yield_type': r[2]} for r in cur.fetchall()]
+            assets = cur.fetchall()
         return jsonify(assets)
     finally:
         db.return_connection(conn)
@@ -1,5 +1,6 @@
 """Authentication API routes"""
 import re
+import orjson
 from flask import Blueprint, request, jsonify, current_app, redirect, url_for
 from flask_login import login_user, logout_user, login_required, current_user
 
@@ -53,6 +54,9 @@ def validate_password(password: str) -> tuple:
     """
     if len(password) < 8:
         return False, "Password must be at least 8 characters long"
+    # bcrypt only uses the first 72 bytes; reject rather than silently truncate
+    if len(password.encode('utf-8')) > 72:
+        return False, "Password must be at most 72 bytes long"
     if not re.search(r'[A-Za-z]', password):
         return False, "Password must contain at least one letter"
     if not re.search(r'\d', password):
@@ -160,6 +164,10 @@ def login():
     if not password_hash or not user_queries.verify_password(password, password_hash):
         return jsonify({'error': 'Invalid email or password'}), 401
     
+    # Upgrade hashes made before BCRYPT_ROUNDS was raised
+    if user_queries.password_needs_rehash(password_hash):
+        user_queries.update_password_hash(user.user_id, password)
+    
     # Check if email is verified
     if not user.email_verified:
         return jsonify({
@@ -274,7 +282,7 @@ def resend_verification():
             try:
                 with conn.cursor() as cur:
                     cur.execute(
-                        "UPDATE users SET verification_token = %s WHERE email = %s",
+                        "UPDATE users SET verification_token = %s WHERE lower(email) = %s",
                         (verification_token, email)
                     )
                     conn.commit()
@@ -349,12 +357,6 @@ def wallet_login():
     if not validate_cardano_address(wallet_address):
         return jsonify({'error': 'Invalid Cardano address'}), 400
 
-    # Get and delete the challenge (one-time use)
-    nonce = user_queries.get_and_delete_wallet_challenge(wallet_address)
-
-    if not nonce:
-        return jsonify({'error': 'No valid challenge found. Please request a new challenge.'}), 400
-
     # For MVP: Accept the signature as proof the user approved in their wallet
     # The fact that they could:
     # 1. Connect to the wallet (requires wallet owner approval)
@@ -364,16 +366,32 @@ def wallet_login():
     #
     # Full COSE_Sign1 verification can be added later for high-security scenarios
 
-    if not signature:
-        return jsonify({'error': 'Signature is required'}), 400
+    if signature and data.get('tos_accepted', False):
+        # Consume the challenge and get or create the user (refreshing
+        # wallet_type) in one statement
+        result = user_queries.redeem_wallet_challenge(
+            wallet_address,
+            wallet_type=wallet_type,
+            tos_version=CURRENT_TOS_VERSION
+        )
+        if not result:
+            return jsonify({'error': 'No valid challenge found. Please request a new challenge.'}), 400
+        user, is_new = result
+    else:
+        # Get and delete the challenge (one-time use)
+        nonce = user_queries.get_and_delete_wallet_challenge(wallet_address)
+
+        if not nonce:
+            return jsonify({'error': 'No valid challenge found. Please request a new challenge.'}), 400
 
-    # Check if user exists
-    user = user_queries.get_user_by_wallet(wallet_address)
+        if not signature:
+            return jsonify({'error': 'Signature is required'}), 400
 
-    if not user:
-        # For new wallet users, require ToS acceptance
-        tos_accepted = data.get('tos_accepted', False)
-        if not tos_accepted:
+        # Check if user exists
+        user = user_queries.get_user_by_wallet(wallet_address)
+
+        if not user:
+            # For new wallet users, require ToS acceptance
             return jsonify({
                 'error': 'tos_required',
                 'message': 'Please accept the Terms of Service to continue',
@@ -381,25 +399,16 @@ def wallet_login():
                 'privacy_url': '/privacy'
             }), 400
 
-        # Create new wallet user with ToS acceptance
-        user = user_queries.create_wallet_user(
-            wallet_address,
-            wallet_type=wallet_type,
-            tos_version=CURRENT_TOS_VERSION
-        )
-        if not user:
-            return jsonify({'error': 'Failed to create user'}), 500
-
-        # Create default saved charts for new user
-        chart_queries.create_default_charts(user.user_id)
-        is_new = True
-    else:
         # Update wallet_type if provided and different
         if wallet_type and user.wallet_type != wallet_type:
             user_queries.update_wallet_type(user.user_id, wallet_type)
             user.wallet_type = wallet_type
         is_new = False
 
+    if is_new:
+        # Create default saved charts for new user
+        chart_queries.create_default_charts(user.user_id)
+
     # Log in user
     login_user(user)
 
@@ -509,7 +518,9 @@ def accept_tos():
 def list_charts():
     """List user's saved charts"""
     charts = chart_queries.get_user_charts(current_user.user_id)
-    return jsonify([c.to_dict() for c in charts])
+    # orjson serializes the dataclasses (and their datetimes) in C, with the
+    # same keys and ISO timestamps as SavedChart.to_dict()
+    return current_app.response_class(orjson.dumps(charts), mimetype='application/json')
 
 
 @auth_bp.route('/charts', methods=['POST'])
@@ -5,6 +5,12 @@ from typing import Optional, Tuple
 from nacl.signing import VerifyKey
 from nacl.exceptions import BadSignatureError
 import binascii
+import re
+
+# Cardano address identifier: mainnet 'addr1' / testnet 'addr_test1' prefix,
+# followed by bech32 + hex characters (bech32 excludes 'i' and 'o'; suffix
+# is matched case-insensitively, the prefix is not).
+_CARDANO_ADDRESS_PATTERN = re.compile(r'(?:addr1|addr_test1)[0-9a-hj-np-zA-HJ-NP-Z_]+')
 
 
 def generate_nonce() -> str:
@@ -111,34 +117,10 @@ def validate_cardano_address(address: str) -> bool:
     if not address:
         return False
 
-    # Cardano mainnet addresses start with 'addr1'
-    # Testnet addresses start with 'addr_test1'
-    valid_prefixes = ('addr1', 'addr_test1')
-
-    if not address.startswith(valid_prefixes):
-        return False
-
     # Basic length check
     # - Standard bech32: 58-108 characters
     # - Hex-based from CIP-30: can be longer (addr1 + 114 hex chars = ~120+)
     if len(address) < 50 or len(address) > 200:
         return False
 
-    # Check for valid characters (bech32 + hex)
-    # bech32 uses: 0-9, a-z except b, i, o (we're lenient here)
-    # hex uses: 0-9, a-f
-    valid_chars = set('0123456789abcdefghjklmnpqrstuvwxyz_')
-
-    # Get the part after the prefix
-    if address.startswith('addr_test1'):
-        suffix = address[10:].lower()
-    else:
-        suffix = address[5:].lower()
-
-    address_chars = set(suffix)
-
-    if not address_chars.issubset(valid_chars):
-        return False
-
-    return True
-
+    return _CARDANO_ADDRESS_PATTERN.fullmatch(address) is not None
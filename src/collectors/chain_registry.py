@@ -8,6 +8,8 @@ from src.adapters.cardano.chain_adapter import CardanoChainAdapter
 
 class ChainRegistry:
     """Registry for managing multiple blockchain adapters"""
+
+    __slots__ = ('config_path', 'chains', 'chain_configs')
     
     def __init__(self, config_path: Optional[str] = None):
         if config_path is None:
@@ -1,7 +1,7 @@
 """Database models and queries"""
 from src.database.connection import DatabaseConnection
 from src.database.queries import DatabaseQueries, APYQueries
-from src.database.models import APRSnapshot, PriceSnapshot
+from src.database.models import APRSnapshot, Blockchain, PriceSnapshot
 from src.database.setup import setup_database, initialize_from_config, verify_setup
 
 __all__ = [
@@ -9,6 +9,7 @@ __all__ = [
     'DatabaseQueries',
     'APYQueries',
     'APRSnapshot',
+    'Blockchain',
     'PriceSnapshot',
     'setup_database',
     'initialize_from_config',
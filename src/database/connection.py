@@ -1,6 +1,8 @@
 """Database connection management"""
+import orjson
 import psycopg
-from psycopg_pool import ConnectionPool
+from psycopg.types.json import set_json_loads
+from psycopg_pool import AsyncConnectionPool, ConnectionPool
 from typing import Optional
 import yaml
 from pathlib import Path
@@ -9,12 +11,28 @@ from pathlib import Path
 class DatabaseConnection:
     """Manages database connection pool"""
 
-    def __init__(self, config_path: Optional[str] = None):
+    __slots__ = ('config_path', 'connection_pool', 'async_connection_pool', 'db_config',
+                 'application_name', 'statement_timeout_ms')
+
+    def __init__(self, config_path: Optional[str] = None,
+                 application_name: Optional[str] = None,
+                 statement_timeout_ms: Optional[int] = None):
+        """
+        Args:
+            config_path: database.yaml to load (defaults to config/database.yaml)
+            application_name: Shown in pg_stat_activity for this pool's
+                connections; overrides database.yaml's application_name
+            statement_timeout_ms: Server-side statement timeout for this
+                pool's connections; overrides database.yaml's statement_timeout_ms
+        """
         if config_path is None:
             config_path = Path(__file__).parent.parent.parent / "config" / "database.yaml"
         self.config_path = Path(config_path)
         self.connection_pool: Optional[ConnectionPool] = None
+        self.async_connection_pool: Optional[AsyncConnectionPool] = None
         self.load_config()
+        self.application_name = application_name or self.db_config.get('application_name', 'defitracker')
+        self.statement_timeout_ms = statement_timeout_ms or self.db_config.get('statement_timeout_ms')
 
     def load_config(self):
         """Load database configuration"""
@@ -26,26 +44,108 @@ class DatabaseConnection:
 
         self.db_config = config.get('database', {})
 
+    def get_conninfo(self) -> str:
+        """Build the libpq connection string from the loaded config"""
+        return (
+            f"host={self.db_config.get('host', 'localhost')} "
+            f"port={self.db_config.get('port', 5432)} "
+            f"dbname={self.db_config.get('database')} "
+            f"user={self.db_config.get('user')} "
+            f"password={self.db_config.get('password')}"
+        )
+
+    def get_connect_kwargs(self) -> dict:
+        """Extra psycopg.connect() arguments applied to every pooled connection.
+
+        prepare_threshold controls server-side prepared statements: psycopg
+        prepares a query after it has run that many times on a connection.
+        Set it to null in database.yaml to disable preparing (e.g. behind
+        PgBouncer in transaction mode before 1.21).
+
+        application_name tags the connections in pg_stat_activity and the
+        server logs; statement_timeout_ms, when set, makes the server cancel
+        any statement that runs longer.
+        """
+        kwargs = {
+            'prepare_threshold': self.db_config.get('prepare_threshold', 1),
+            'application_name': self.application_name,
+        }
+        if self.statement_timeout_ms:
+            kwargs['options'] = f"-c statement_timeout={int(self.statement_timeout_ms)}"
+        return kwargs
+
+    def configure_connection(self, conn):
+        """Pool ``configure`` callback run once on every new connection.
+
+        prepared_max caps how many prepared statements psycopg keeps per
+        connection (least recently used ones are deallocated). The default
+        of 100 is raised so the query modules, API and collectors do not
+        evict each other's statements on a shared pooled connection.
+
+        json/jsonb columns (saved chart filters, options) are parsed with
+        orjson instead of the stdlib json module.
+        """
+        conn.prepared_max = self.db_config.get('prepared_max', 200)
+        set_json_loads(orjson.loads, conn)
+
+    def get_pool_size(self) -> dict:
+        """min_size/max_size for the connection pools.
+
+        min_size connections are opened up front and kept warm, so collectors
+        and API requests never pay TCP/auth setup on the hot path.
+        """
+        return {
+            'min_size': self.db_config.get('pool_min_size', 4),
+            'max_size': self.db_config.get('pool_max_size', 16),
+        }
+
     def get_connection_pool(self):
         """Get or create connection pool"""
         if self.connection_pool is None:
-            conninfo = (
-                f"host={self.db_config.get('host', 'localhost')} "
-                f"port={self.db_config.get('port', 5432)} "
-                f"dbname={self.db_config.get('database')} "
-                f"user={self.db_config.get('user')} "
-                f"password={self.db_config.get('password')}"
+            self.connection_pool = ConnectionPool(
+                self.get_conninfo(), kwargs=self.get_connect_kwargs(),
+                configure=self.configure_connection, check=ConnectionPool.check_connection,
+                **self.get_pool_size()
             )
-            self.connection_pool = ConnectionPool(conninfo, min_size=1, max_size=10)
         return self.connection_pool
 
-    def get_connection(self):
-        """Get a connection from the pool"""
+    async def _configure_async_connection(self, conn):
+        """AsyncConnectionPool variant of configure_connection"""
+        self.configure_connection(conn)
+
+    async def get_async_connection_pool(self) -> AsyncConnectionPool:
+        """Get or create the asyncio connection pool.
+
+        Used for concurrent ingestion; use ``async with pool.connection() as conn``
+        so each coroutine holds its own connection.
+        """
+        if self.async_connection_pool is None:
+            pool = AsyncConnectionPool(
+                self.get_conninfo(), kwargs=self.get_connect_kwargs(),
+                configure=self._configure_async_connection, check=AsyncConnectionPool.check_connection,
+                open=False, **self.get_pool_size()
+            )
+            await pool.open()
+            self.async_connection_pool = pool
+        return self.async_connection_pool
+
+    def get_connection(self, read_only: bool = False):
+        """Get a connection from the pool.
+
+        read_only=True hands the connection out in autocommit mode, so a lone
+        SELECT is not wrapped in an implicit BEGIN that the pool then has to
+        roll back on return. return_connection restores transactional mode.
+        """
         pool = self.get_connection_pool()
-        return pool.getconn()
+        conn = pool.getconn()
+        if read_only:
+            conn.autocommit = True
+        return conn
 
     def return_connection(self, conn):
         """Return a connection to the pool"""
+        if conn.autocommit and not conn.closed:
+            conn.autocommit = False
         pool = self.get_connection_pool()
         pool.putconn(conn)
 
@@ -54,3 +154,10 @@ class DatabaseConnection:
         if self.connection_pool:
             self.connection_pool.close()
             self.connection_pool = None
+
+    async def close_all_async(self):
+        """Close all connections in both the sync and the asyncio pool"""
+        self.close_all()
+        if self.async_connection_pool:
+            await self.async_connection_pool.close()
+            self.async_connection_pool = None
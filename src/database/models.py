@@ -3,12 +3,39 @@ from datetime import datetime
 from typing import Optional, Literal
 from decimal import Decimal
 from dataclasses import dataclass
+import sys
 
 # Valid yield types
 YieldType = Literal['lp', 'supply', 'borrow']
 
+# Snapshot models are created by the thousand for history queries; use slotted
+# dataclasses where the running Python supports it (3.10+)
+_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
 
-@dataclass
+# Read-only snapshot rows are also frozen (hashable, safe to share between caches);
+# derive modified copies with dataclasses.replace()
+_FROZEN_SLOTS = {**_SLOTS, 'frozen': True}
+
+
+@dataclass(**_FROZEN_SLOTS)
+class Blockchain:
+    """An enabled blockchain row"""
+    blockchain_id: int
+    name: str
+    chain_id: int
+    rpc_url: Optional[str] = None
+
+    def to_dict(self) -> dict:
+        """Convert to dictionary for JSON serialization"""
+        return {
+            'blockchain_id': self.blockchain_id,
+            'name': self.name,
+            'chain_id': self.chain_id,
+            'rpc_url': self.rpc_url
+        }
+
+
+@dataclass(**_FROZEN_SLOTS)
 class APRSnapshot:
     """Represents a single APR snapshot (legacy/generic)"""
     blockchain_id: int
@@ -32,7 +59,7 @@ class APRSnapshot:
         }
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class PriceSnapshot:
     """Represents a token price snapshot"""
     token_symbol: str
@@ -76,7 +103,7 @@ class PriceSnapshot:
         }
 
 
-@dataclass
+@dataclass(**_FROZEN_SLOTS)
 class LiqwidAPYSnapshot:
     """Represents a Liqwid Finance protocol APY snapshot"""
     asset_id: int
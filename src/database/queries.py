@@ -1,22 +1,507 @@
 """Database queries for APR/APY data"""
-from typing import List, Optional, Dict, Any, Tuple
-from datetime import datetime, timedelta, date
+from typing import List, Optional, Dict, Any, Iterator, Tuple
+from datetime import datetime, date, timezone
 from decimal import Decimal
-from zoneinfo import ZoneInfo
-from psycopg.rows import dict_row
+from contextlib import contextmanager
+from functools import lru_cache
+from psycopg.rows import class_row, dict_row, scalar_row
 import logging
+import threading
+import time
+import uuid
 
 from src.database.connection import DatabaseConnection
-from src.database.models import APRSnapshot, LiqwidAPYSnapshot, PriceSnapshot
+from src.database.models import APRSnapshot, Blockchain, LiqwidAPYSnapshot, PriceSnapshot
 
 logger = logging.getLogger(__name__)
 
+# How long get_latest_price / get_latest_liqwid_apy / get_active_tracked_pools
+# results are served from memory. Data is collected at most once per polling
+# interval, so a short TTL only ever hides a row for a few seconds; writes made
+# through the same query instance invalidate their entries immediately.
+LATEST_CACHE_TTL_SECONDS = 30
 
-class DatabaseQueries:
+
+_APR_SNAPSHOT_TARGET = """apr_snapshots
+    (blockchain_id, protocol_id, asset_id, apr, timestamp, yield_type, tvl_usd, fees_24h, volume_24h, version, apr_1d, fee_apr, staking_apr, farm_apr, swap_fee_percent)"""
+
+_PRICE_SNAPSHOT_TARGET = """price_snapshots (
+    token_symbol, token_address, price_usd,
+    quote_token_symbol, quote_token_address, price_in_quote,
+    source, pair_address, reserve_token, reserve_quote,
+    timestamp
+)"""
+
+_LIQWID_SNAPSHOT_TARGET = """liqwid_apy_snapshots (
+    asset_id, market_id, supply_apy, lq_supply_apy, total_supply_apy,
+    borrow_apy, total_supply, total_borrows, utilization_rate,
+    available_liquidity, total_supply_usd, total_borrows_usd,
+    token_price_usd, yield_type, timestamp
+)"""
+
+# Rows per multi-row INSERT statement (15 APR columns -> 15000 parameters,
+# well under the 65535 bind parameter limit)
+_MULTI_INSERT_MAX_ROWS = 1000
+
+
+def _apr_snapshot_params(rows: List[Dict[str, Any]]) -> List[Tuple]:
+    """Turn insert_apr_snapshots_bulk row dicts into _APR_SNAPSHOT_TARGET parameter tuples"""
+    now = datetime.now(timezone.utc)
+    return [
+        (
+            row['blockchain_id'], row['protocol_id'], row['asset_id'], row['apr'],
+            row.get('timestamp') or now, row.get('yield_type') or 'lp',
+            row.get('tvl_usd'), row.get('fees_24h'), row.get('volume_24h'),
+            row.get('version'), row.get('apr_1d'), row.get('fee_apr'),
+            row.get('staking_apr'), row.get('farm_apr'), row.get('swap_fee_percent'),
+        )
+        for row in rows
+    ]
+
+
+def _latest_aprs_query(by_blockchain: bool, by_protocol: bool, by_asset: bool) -> str:
+    """get_latest_aprs SQL for one combination of filters"""
+    # Filters are applied to apr_snapshots' own ID columns, before DISTINCT ON
+    # and before the name joins, so only the matching index ranges are read
+    conditions = [
+        condition
+        for enabled, condition in (
+            (by_blockchain, "blockchain_id IN (SELECT blockchain_id FROM blockchains WHERE name = %s)"),
+            (by_protocol, "protocol_id IN (SELECT protocol_id FROM protocols WHERE name = %s)"),
+            (by_asset, "asset_id IN (SELECT asset_id FROM assets WHERE symbol = %s)"),
+        )
+        if enabled
+    ]
+    where = "WHERE " + " AND ".join(conditions) if conditions else ""
+
+    # DISTINCT ON walks idx_apr_snapshots_lookup once instead of
+    # running a MAX(timestamp) subquery per snapshot row
+    return f"""
+        WITH latest AS (
+            SELECT DISTINCT ON (blockchain_id, protocol_id, asset_id)
+                blockchain_id, protocol_id, asset_id, apr, timestamp
+            FROM apr_snapshots
+            {where}
+            ORDER BY blockchain_id, protocol_id, asset_id, timestamp DESC
+        )
+        SELECT b.name AS blockchain, p.name AS protocol, a.symbol AS asset,
+               s.apr, s.timestamp
+        FROM latest s
+        JOIN blockchains b ON s.blockchain_id = b.blockchain_id
+        JOIN protocols p ON s.protocol_id = p.protocol_id
+        JOIN assets a ON s.asset_id = a.asset_id
+        ORDER BY blockchain, protocol, asset
+    """
+
+
+# get_latest_aprs SQL keyed by which of (blockchain, protocol, asset) are
+# filtered on. Built once so every call of a given shape sends identical
+# text and reuses its prepared statement.
+_LATEST_APR_QUERIES = {
+    (b, p, a): _latest_aprs_query(b, p, a)
+    for b in (False, True)
+    for p in (False, True)
+    for a in (False, True)
+}
+
+
+# protocol_ingest_state (maintained by triggers, see 031) answers the usual
+# "collected today?" question with a primary key lookup. Only for an earlier
+# date, or a protocol without a state row, is apr_snapshots scanned.
+# Params: (date_est, protocol_id)
+_HAS_PROTOCOL_SNAPSHOTS_SQL = """
+    WITH params AS (
+        SELECT %s::date AS date_est, %s::int AS protocol_id
+    )
+    SELECT CASE
+        WHEN s.last_snapshot_date_est = params.date_est THEN TRUE
+        WHEN s.last_snapshot_date_est < params.date_est THEN FALSE
+        ELSE EXISTS (
+            SELECT 1 FROM apr_snapshots
+            WHERE protocol_id = params.protocol_id
+              AND timestamp >= (params.date_est::timestamp AT TIME ZONE 'America/New_York')
+              AND timestamp < ((params.date_est + 1)::timestamp AT TIME ZONE 'America/New_York')
+        )
+    END
+    FROM params
+    LEFT JOIN protocol_ingest_state s ON s.protocol_id = params.protocol_id
+"""
+
+_ACTIVE_TRACKED_POOLS_SQL = """
+    SELECT id, pool_identifier, pair_name, version,
+           first_tracked_date, last_above_threshold_date,
+           consecutive_days_below
+    FROM tracked_pools
+    WHERE protocol = %s AND is_active = TRUE
+    ORDER BY pair_name
+"""
+
+# One statement whether or not a source is given, so a single prepared plan is reused
+_LATEST_PRICE_SQL = """
+    SELECT snapshot_id, token_symbol, token_address, price_usd,
+           quote_token_symbol, quote_token_address, price_in_quote,
+           source, pair_address, reserve_token, reserve_quote, timestamp
+    FROM price_snapshots
+    WHERE token_symbol = %s AND (%s::text IS NULL OR source = %s)
+    ORDER BY timestamp DESC
+    LIMIT 1
+"""
+
+
+# LiqwidAPYSnapshot field -> select expression for the Liqwid snapshot readers
+_LIQWID_HISTORY_COLUMNS = {
+    'snapshot_id': 'l.snapshot_id',
+    'asset_id': 'l.asset_id',
+    'asset_symbol': 'a.symbol AS asset_symbol',
+    'market_id': 'l.market_id',
+    'supply_apy': 'l.supply_apy',
+    'lq_supply_apy': 'l.lq_supply_apy',
+    'total_supply_apy': 'l.total_supply_apy',
+    'borrow_apy': 'l.borrow_apy',
+    'total_supply': 'l.total_supply',
+    'total_borrows': 'l.total_borrows',
+    'utilization_rate': 'l.utilization_rate',
+    'available_liquidity': 'l.available_liquidity',
+    'yield_type': 'l.yield_type',
+    'timestamp': 'l.timestamp',
+}
+
+# Full LiqwidAPYSnapshot select list over "l" (snapshots) joined to "a" (assets)
+_LIQWID_SNAPSHOT_COLUMNS = ', '.join(_LIQWID_HISTORY_COLUMNS.values())
+
+
+_LATEST_LIQWID_APY_SQL = f"""
+    SELECT {_LIQWID_SNAPSHOT_COLUMNS}
+    FROM liqwid_apy_snapshots l
+    JOIN assets a ON l.asset_id = a.asset_id
+    WHERE a.symbol = %s
+    ORDER BY l.timestamp DESC
+    LIMIT 1
+"""
+
+_ALL_LATEST_LIQWID_APYS_SQL = f"""
+    SELECT DISTINCT ON (a.symbol) {_LIQWID_SNAPSHOT_COLUMNS}
+    FROM latest_liqwid_apys l
+    JOIN assets a ON l.asset_id = a.asset_id
+    ORDER BY a.symbol, l.timestamp DESC
+"""
+
+
+@lru_cache(maxsize=32)
+def _liqwid_history_query(columns: Optional[Tuple[str, ...]]) -> str:
+    """SQL for the Liqwid APY history readers; params are (asset_symbol, days).
+
+    Memoized so repeat calls reuse the same string (and psycopg's prepared
+    statement for it) instead of rebuilding the select list.
+    """
+    if columns is None:
+        selected = _LIQWID_SNAPSHOT_COLUMNS
+    else:
+        unknown = set(columns) - set(_LIQWID_HISTORY_COLUMNS)
+        if unknown:
+            raise ValueError(f"Unknown Liqwid APY columns: {sorted(unknown)}")
+        wanted = {'asset_id', 'asset_symbol', *columns}
+        selected = ', '.join(expr for field, expr in _LIQWID_HISTORY_COLUMNS.items() if field in wanted)
+
+    return f"""
+        SELECT {selected}
+        FROM liqwid_apy_snapshots l
+        JOIN assets a ON l.asset_id = a.asset_id
+        WHERE a.symbol = %s
+          AND l.timestamp >= NOW() - make_interval(days => %s)
+        ORDER BY l.timestamp DESC
+    """
+
+
+def _liqwid_snapshot_params(snapshot: LiqwidAPYSnapshot, now: datetime) -> Tuple:
+    """Column values for a liqwid_apy_snapshots INSERT, in table order.
+
+    utilization_rate is derived from total_borrows / total_supply at insert
+    time when the source did not report it, so every stored row carries it.
+    """
+    utilization_rate = snapshot.utilization_rate
+    if utilization_rate is None and snapshot.total_supply and snapshot.total_borrows is not None:
+        utilization_rate = snapshot.total_borrows / snapshot.total_supply
+
+    return (
+        snapshot.asset_id,
+        snapshot.market_id,
+        snapshot.supply_apy,
+        snapshot.lq_supply_apy,
+        snapshot.total_supply_apy,
+        snapshot.borrow_apy,
+        snapshot.total_supply,
+        snapshot.total_borrows,
+        utilization_rate,
+        snapshot.available_liquidity,
+        snapshot.total_supply_usd,
+        snapshot.total_borrows_usd,
+        snapshot.token_price_usd,
+        snapshot.yield_type or 'supply',
+        snapshot.timestamp or now
+    )
+
+
+# ON CONFLICT target for assets: the expression unique index from migration
+# 033 treats a NULL contract address as '', so one statement shape covers
+# assets with and without a contract (NULLs never conflict on
+# UNIQUE(symbol, contract_address) itself)
+_ASSET_CONFLICT_TARGET = "(symbol, (COALESCE(contract_address, '')))"
+
+# Returns (asset_id, inserted) for an asset
+_UPSERT_ASSET_SQL = f"""INSERT INTO assets (symbol, name, contract_address, decimals)
+               VALUES (%s, %s, %s, %s)
+               ON CONFLICT {_ASSET_CONFLICT_TARGET} DO UPDATE SET symbol = EXCLUDED.symbol
+               RETURNING asset_id, (xmax = 0) AS inserted"""
+
+# Upserts the asset and inserts the snapshot in one statement; returns
+# (snapshot_id, asset_id). The asset upsert always returns its row, so the
+# snapshot is never silently dropped.
+# Params: (symbol, name, contract_address, blockchain_id, protocol_id, ...)
+_INSERT_APR_SNAPSHOT_WITH_ASSET_SQL = f"""WITH a AS (
+        INSERT INTO assets (symbol, name, contract_address)
+        VALUES (%s, %s, %s)
+        ON CONFLICT {_ASSET_CONFLICT_TARGET} DO UPDATE SET symbol = EXCLUDED.symbol
+        RETURNING asset_id
+    )
+    INSERT INTO apr_snapshots
+    (blockchain_id, protocol_id, asset_id, apr, timestamp, yield_type, tvl_usd, fees_24h, volume_24h, version, apr_1d, fee_apr, staking_apr, farm_apr, swap_fee_percent)
+    SELECT %s, %s, a.asset_id,
+           %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s
+    FROM a
+    RETURNING snapshot_id, asset_id"""
+
+
+# get_or_create_blockchains_and_protocols: inserts missing blockchains and
+# protocols (DO NOTHING, so existing rows are not rewritten) and returns
+# (blockchain_id or NULL for a blockchain row, name, id, inserted)
+_UPSERT_BLOCKCHAINS_AND_PROTOCOLS_SQL = """WITH bc AS (
+        SELECT * FROM UNNEST(%s::text[], %s::int[], %s::text[])
+            AS bc(name, chain_id, rpc_url)
+    ), pc AS (
+        SELECT * FROM UNNEST(%s::text[], %s::text[], %s::text[])
+            AS pc(blockchain_name, name, api_url)
+    ), b_new AS (
+        INSERT INTO blockchains (name, chain_id, rpc_url)
+        SELECT name, chain_id, rpc_url FROM bc
+        ON CONFLICT (name) DO NOTHING
+        RETURNING blockchain_id, name
+    ), b AS (
+        SELECT blockchain_id, name, TRUE AS inserted FROM b_new
+        UNION ALL
+        SELECT blockchains.blockchain_id, blockchains.name, FALSE
+        FROM blockchains JOIN bc ON bc.name = blockchains.name
+    ), p_new AS (
+        INSERT INTO protocols (blockchain_id, name, api_url)
+        SELECT b.blockchain_id, pc.name, pc.api_url
+        FROM pc JOIN b ON b.name = pc.blockchain_name
+        ON CONFLICT (blockchain_id, name) DO NOTHING
+        RETURNING blockchain_id, name, protocol_id
+    ), p AS (
+        SELECT blockchain_id, name, protocol_id, TRUE AS inserted FROM p_new
+        UNION ALL
+        SELECT protocols.blockchain_id, protocols.name, protocols.protocol_id, FALSE
+        FROM protocols
+        JOIN b ON b.blockchain_id = protocols.blockchain_id
+        JOIN pc ON pc.blockchain_name = b.name AND pc.name = protocols.name
+    )
+    SELECT NULL::int, name, blockchain_id, inserted FROM b
+    UNION ALL
+    SELECT blockchain_id, name, protocol_id, inserted FROM p"""
+
+
+def _multi_insert_returning(cur, target: str, rows: List[Tuple], returning: str,
+                            batch_size: int = _MULTI_INSERT_MAX_ROWS) -> List[Any]:
+    """INSERT rows with one multi-row VALUES statement per batch_size chunk.
+
+    One parse/plan and one round-trip per chunk instead of one per row.
+    Multi-row statement text depends on the chunk size, so only the
+    single-row shape is left to prepare_threshold; preparing the others would
+    just churn the per-connection prepared statement cache.
+
+    Assumes RETURNING yields rows in VALUES order. PostgreSQL does not
+    document that ordering, but a plain single-statement INSERT ... VALUES
+    (no ON CONFLICT, triggers or partitions reordering rows) returns them
+    in order in practice, and the bulk insert methods rely on it to map
+    IDs back to their inputs.
+
+    Args:
+        cur: Cursor to run on
+        target: "table (col, ...)" to insert into
+        rows: Parameter tuples, all the same width as the column list
+        returning: Single RETURNING expression
+        batch_size: Rows per statement (keep batch_size * columns <= 65535)
+
+    Returns:
+        The RETURNING value of each row, in the same order as rows (see above)
+    """
+    returned = []
+    for query, params, prepare in _multi_insert_statements(target, rows, returning, batch_size):
+        cur.execute(query, params, prepare=prepare)
+        returned.extend(row[0] for row in cur.fetchall())
+    return returned
+
+
+async def _multi_insert_returning_async(cur, target: str, rows: List[Tuple], returning: str,
+                                        batch_size: int = _MULTI_INSERT_MAX_ROWS) -> List[Any]:
+    """Async variant of _multi_insert_returning for an AsyncCursor"""
+    returned = []
+    for query, params, prepare in _multi_insert_statements(target, rows, returning, batch_size):
+        await cur.execute(query, params, prepare=prepare)
+        returned.extend(row[0] for row in await cur.fetchall())
+    return returned
+
+
+def _multi_insert_statements(target: str, rows: List[Tuple], returning: str, batch_size: int):
+    """Yield (query, params, prepare) for each batch_size chunk of rows"""
+    placeholders = "(" + ", ".join(["%s"] * len(rows[0])) + ")"
+    for start in range(0, len(rows), batch_size):
+        chunk = rows[start:start + batch_size]
+        yield (
+            f"INSERT INTO {target} VALUES {', '.join([placeholders] * len(chunk))} RETURNING {returning}",
+            [value for row in chunk for value in row],
+            None if len(chunk) == 1 else False,
+        )
+
+
+class _BatchableQueries:
+    """Connection handling shared by the query classes.
+
+    Query methods borrow connections through _get_connection/_commit/
+    _rollback/_return_connection. Inside a batch() block those reuse one
+    connection for the calling thread and leave commit/rollback to the block,
+    so many writes share a single transaction (and a single WAL flush).
+    """
+
+    db: DatabaseConnection
+    _id_cache: Dict[Tuple, int]
+    # Short-lived query results: key -> (expires_at, value)
+    _latest_cache: Dict[Tuple, Tuple[float, Any]]
+    _batch_local: threading.local
+
+    @contextmanager
+    def batch(self):
+        """Run every query issued by this thread in one transaction.
+
+        Commits when the block exits normally and rolls back if it raises.
+        Nested batch() blocks join the outer transaction.
+
+        Example:
+            with queries.batch():
+                for snapshot in snapshots:
+                    queries.insert_liqwid_apy_snapshot(snapshot)
+        """
+        if getattr(self._batch_local, 'conn', None) is not None:
+            yield self
+            return
+
+        conn = self.db.get_connection()
+        self._batch_local.conn = conn
+        try:
+            yield self
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            # Rows created inside the rolled-back transaction no longer exist
+            self.clear_caches()
+            raise
+        finally:
+            self._batch_local.conn = None
+            self.db.return_connection(conn)
+
+    @contextmanager
+    def pipeline(self):
+        """batch() with the shared connection in pipeline mode.
+
+        Statements are sent without waiting for each reply; the client only
+        blocks when a method reads a result (e.g. a RETURNING id). Writes whose
+        results are not read - such as the final COMMIT - ride along with the
+        next statement instead of costing a round-trip each. Worth it against remote databases where latency
+        dominates; a failed statement aborts the whole block.
+
+        Example:
+            with queries.pipeline():
+                for rows in rows_by_protocol.values():
+                    queries.insert_apr_snapshots_bulk(rows)
+        """
+        with self.batch():
+            with self._batch_local.conn.pipeline():
+                yield self
+
+    def clear_caches(self):
+        """Drop every in-process cache held by this instance.
+
+        Needed only if rows are deleted or rewritten behind this instance's
+        back (e.g. a test truncating tables); batch() calls it on rollback.
+        """
+        self._id_cache.clear()
+        self._latest_cache.clear()
+
+    def _get_cached_latest(self, key: Tuple) -> Tuple[bool, Any]:
+        """Return (hit, value) for a LATEST_CACHE_TTL_SECONDS cache key.
+
+        The cache is bypassed inside batch() so uncommitted rows are never cached.
+        """
+        if self._in_batch():
+            return False, None
+        entry = self._latest_cache.get(key)
+        if entry is None or entry[0] <= time.monotonic():
+            return False, None
+        return True, entry[1]
+
+    def _set_cached_latest(self, key: Tuple, value: Any):
+        if not self._in_batch():
+            self._latest_cache[key] = (time.monotonic() + LATEST_CACHE_TTL_SECONDS, value)
+
+    def _in_batch(self) -> bool:
+        return getattr(self._batch_local, 'conn', None) is not None
+
+    def _get_connection(self):
+        """Get the batch connection if one is active, otherwise a pooled one"""
+        if self._in_batch():
+            return self._batch_local.conn
+        return self.db.get_connection()
+
+    def _commit(self, conn):
+        """Commit unless a batch() owns the transaction"""
+        if not self._in_batch():
+            conn.commit()
+
+    def _rollback(self, conn):
+        """Roll back unless a batch() owns the transaction (it rolls back on exit)"""
+        if not self._in_batch():
+            conn.rollback()
+
+    def _return_connection(self, conn):
+        """Return the connection to the pool unless it belongs to a batch()"""
+        if not self._in_batch():
+            self.db.return_connection(conn)
+
+    def _get_read_connection(self):
+        """Get a connection for a read-only method.
+
+        Outside a batch the connection is handed out in autocommit mode, so a
+        lone SELECT is not wrapped in an implicit BEGIN/ROLLBACK pair.
+        """
+        if self._in_batch():
+            return self._batch_local.conn
+        return self.db.get_connection(read_only=True)
+
+    def _return_read_connection(self, conn):
+        """Return a connection from _get_read_connection"""
+        self._return_connection(conn)
+
+
+class DatabaseQueries(_BatchableQueries):
     """Database query operations (legacy APR tracking)"""
     
     def __init__(self, db_connection: Optional[DatabaseConnection] = None):
         self.db = db_connection or DatabaseConnection()
+        # blockchain/protocol/asset IDs never change once created, so cache
+        # them per instance to skip FK-resolution round-trips
+        self._id_cache: Dict[Tuple, int] = {}
+        self._latest_cache: Dict[Tuple, Tuple[float, Any]] = {}
+        self._batch_local = threading.local()
     
     # ============================================
     # Blockchain Operations
@@ -24,60 +509,82 @@ class DatabaseQueries:
     
     def get_or_create_blockchain(self, name: str, chain_id: int, rpc_url: Optional[str] = None) -> int:
         """Get blockchain ID, create if doesn't exist"""
-        conn = self.db.get_connection()
+        cache_key = ('blockchain', name)
+        cached = self._id_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        conn = self._get_connection()
         try:
             with conn.cursor() as cur:
+                # DO NOTHING plus a read of the existing row, so a lookup
+                # never writes (DO UPDATE would fire the updated_at trigger)
                 cur.execute(
-                    "SELECT blockchain_id FROM blockchains WHERE name = %s",
-                    (name,)
+                    """WITH new AS (
+                           INSERT INTO blockchains (name, chain_id, rpc_url)
+                           VALUES (%s, %s, %s)
+                           ON CONFLICT (name) DO NOTHING
+                           RETURNING blockchain_id
+                       )
+                       SELECT blockchain_id, TRUE AS inserted FROM new
+                       UNION ALL
+                       SELECT blockchain_id, FALSE FROM blockchains WHERE name = %s""",
+                    (name, chain_id, rpc_url, name)
                 )
-                result = cur.fetchone()
-                
-                if result:
-                    return result[0]
-                
-                cur.execute(
-                    """INSERT INTO blockchains (name, chain_id, rpc_url)
-                       VALUES (%s, %s, %s)
-                       RETURNING blockchain_id""",
-                    (name, chain_id, rpc_url)
-                )
-                blockchain_id = cur.fetchone()[0]
-                conn.commit()
-                logger.info(f"Created blockchain: {name} (ID: {blockchain_id})")
+                row = cur.fetchone()
+                if row is None:
+                    # Another transaction inserted the name concurrently: DO
+                    # NOTHING waited for it, but the SELECT branch ran on this
+                    # statement's snapshot. A new statement sees the row.
+                    cur.execute("SELECT blockchain_id, FALSE FROM blockchains WHERE name = %s", (name,))
+                    row = cur.fetchone()
+                blockchain_id, inserted = row
+                self._commit(conn)
+                if inserted:
+                    logger.info(f"Created blockchain: {name} (ID: {blockchain_id})")
+                self._id_cache[cache_key] = blockchain_id
                 return blockchain_id
         except Exception as e:
-            conn.rollback()
+            self._rollback(conn)
             logger.error(f"Error getting/creating blockchain {name}: {e}")
             raise
         finally:
-            self.db.return_connection(conn)
+            self._return_connection(conn)
     
     def get_blockchain_id(self, name: str) -> Optional[int]:
         """Get blockchain ID by name"""
-        conn = self.db.get_connection()
+        cache_key = ('blockchain', name)
+        cached = self._id_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        conn = self._get_read_connection()
         try:
-            with conn.cursor() as cur:
+            with conn.cursor(row_factory=scalar_row) as cur:
                 cur.execute(
                     "SELECT blockchain_id FROM blockchains WHERE name = %s",
-                    (name,)
+                    (name,),
+                    prepare=True
                 )
                 result = cur.fetchone()
-                return result[0] if result else None
+            if result is None:
+                return None
+            self._id_cache[cache_key] = result
+            return result
         finally:
-            self.db.return_connection(conn)
+            self._return_read_connection(conn)
     
-    def get_all_blockchains(self) -> List[Dict]:
-        """Get all blockchains"""
-        conn = self.db.get_connection()
+    def get_all_blockchains(self) -> List[Blockchain]:
+        """Get all enabled blockchains"""
+        conn = self._get_read_connection()
         try:
-            with conn.cursor(row_factory=dict_row) as cur:
+            with conn.cursor(row_factory=class_row(Blockchain)) as cur:
                 cur.execute(
-                    "SELECT * FROM blockchains WHERE enabled = TRUE ORDER BY name"
+                    "SELECT blockchain_id, name, chain_id, rpc_url FROM blockchains WHERE enabled = TRUE ORDER BY name"
                 )
-                return [dict(row) for row in cur.fetchall()]
+                return cur.fetchall()
         finally:
-            self.db.return_connection(conn)
+            self._return_read_connection(conn)
     
     # ============================================
     # Protocol Operations
@@ -85,50 +592,147 @@ class DatabaseQueries:
     
     def get_or_create_protocol(self, blockchain_id: int, name: str, api_url: Optional[str] = None) -> int:
         """Get protocol ID, create if doesn't exist"""
-        conn = self.db.get_connection()
+        cache_key = ('protocol', blockchain_id, name)
+        cached = self._id_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        conn = self._get_connection()
         try:
             with conn.cursor() as cur:
                 cur.execute(
-                    """SELECT protocol_id FROM protocols 
+                    """WITH new AS (
+                           INSERT INTO protocols (blockchain_id, name, api_url)
+                           VALUES (%s, %s, %s)
+                           ON CONFLICT (blockchain_id, name) DO NOTHING
+                           RETURNING protocol_id
+                       )
+                       SELECT protocol_id, TRUE AS inserted FROM new
+                       UNION ALL
+                       SELECT protocol_id, FALSE FROM protocols
                        WHERE blockchain_id = %s AND name = %s""",
-                    (blockchain_id, name)
+                    (blockchain_id, name, api_url, blockchain_id, name)
                 )
-                result = cur.fetchone()
-                
-                if result:
-                    return result[0]
-                
-                cur.execute(
-                    """INSERT INTO protocols (blockchain_id, name, api_url)
-                       VALUES (%s, %s, %s)
-                       RETURNING protocol_id""",
-                    (blockchain_id, name, api_url)
-                )
-                protocol_id = cur.fetchone()[0]
-                conn.commit()
-                logger.info(f"Created protocol: {name} on blockchain {blockchain_id} (ID: {protocol_id})")
+                row = cur.fetchone()
+                if row is None:
+                    # Inserted concurrently; see get_or_create_blockchain
+                    cur.execute(
+                        "SELECT protocol_id, FALSE FROM protocols WHERE blockchain_id = %s AND name = %s",
+                        (blockchain_id, name)
+                    )
+                    row = cur.fetchone()
+                protocol_id, inserted = row
+                self._commit(conn)
+                if inserted:
+                    logger.info(f"Created protocol: {name} on blockchain {blockchain_id} (ID: {protocol_id})")
+                self._id_cache[cache_key] = protocol_id
                 return protocol_id
         except Exception as e:
-            conn.rollback()
+            self._rollback(conn)
             logger.error(f"Error getting/creating protocol {name}: {e}")
             raise
         finally:
-            self.db.return_connection(conn)
+            self._return_connection(conn)
     
+    def get_or_create_blockchains_and_protocols(
+        self,
+        blockchains: List[Tuple[str, int, Optional[str]]],
+        protocols: List[Tuple[str, str, Optional[str]]],
+    ) -> Tuple[int, int]:
+        """Upsert blockchains and their protocols in a single statement.
+
+        The protocols resolve their blockchain_id by joining on the blockchain
+        CTE server-side, so a whole config loads in one round-trip. Rows
+        another session inserted while the statement ran are invisible to its
+        snapshot, so if any name comes back unresolved the statement is run
+        once more, which sees them (and inserts the protocols skipped with
+        their blockchain).
+
+        Args:
+            blockchains: (name, chain_id, rpc_url) rows
+            protocols: (blockchain_name, name, api_url) rows; rows whose
+                blockchain is not in blockchains are ignored
+
+        Returns:
+            (blockchains_created, protocols_created)
+        """
+        if not blockchains:
+            return 0, 0
+
+        chain_names, chain_ids, rpc_urls = zip(*blockchains)
+        protocol_columns = tuple(zip(*protocols)) if protocols else ((), (), ())
+        expected_protocols = {
+            (blockchain_name, name) for blockchain_name, name, _ in protocols
+            if blockchain_name in chain_names
+        }
+
+        # (blockchain_id or None, name) -> (row_id, inserted)
+        resolved: Dict[Tuple[Optional[int], str], Tuple[int, bool]] = {}
+        conn = self._get_connection()
+        try:
+            with conn.cursor() as cur:
+                for _ in range(2):
+                    cur.execute(
+                        _UPSERT_BLOCKCHAINS_AND_PROTOCOLS_SQL,
+                        (list(chain_names), list(chain_ids), list(rpc_urls))
+                        + tuple(list(column) for column in protocol_columns)
+                    )
+                    for blockchain_id, name, row_id, inserted in cur.fetchall():
+                        # A row created by the first run comes back as
+                        # existing on the second
+                        _, created_earlier = resolved.get((blockchain_id, name), (None, False))
+                        resolved[(blockchain_id, name)] = (row_id, inserted or created_earlier)
+                    chain_ids_by_name = {
+                        name: row_id
+                        for (blockchain_id, name), (row_id, _) in resolved.items()
+                        if blockchain_id is None
+                    }
+                    if len(chain_ids_by_name) == len(set(chain_names)) and all(
+                        (chain_ids_by_name[blockchain_name], name) in resolved
+                        for blockchain_name, name in expected_protocols
+                    ):
+                        break
+                self._commit(conn)
+        except Exception as e:
+            self._rollback(conn)
+            logger.error(f"Error initializing blockchains and protocols: {e}")
+            raise
+        finally:
+            self._return_connection(conn)
+
+        blockchains_created = protocols_created = 0
+        for (blockchain_id, name), (row_id, inserted) in resolved.items():
+            if blockchain_id is None:
+                self._id_cache[('blockchain', name)] = row_id
+                blockchains_created += inserted
+            else:
+                self._id_cache[('protocol', blockchain_id, name)] = row_id
+                protocols_created += inserted
+        return blockchains_created, protocols_created
+
     def get_protocol_id(self, blockchain_id: int, protocol_name: str) -> Optional[int]:
         """Get protocol ID by blockchain and name"""
-        conn = self.db.get_connection()
+        cache_key = ('protocol', blockchain_id, protocol_name)
+        cached = self._id_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        conn = self._get_read_connection()
         try:
-            with conn.cursor() as cur:
+            with conn.cursor(row_factory=scalar_row) as cur:
                 cur.execute(
                     """SELECT protocol_id FROM protocols 
                        WHERE blockchain_id = %s AND name = %s""",
-                    (blockchain_id, protocol_name)
+                    (blockchain_id, protocol_name),
+                    prepare=True
                 )
                 result = cur.fetchone()
-                return result[0] if result else None
+            if result is None:
+                return None
+            self._id_cache[cache_key] = result
+            return result
         finally:
-            self.db.return_connection(conn)
+            self._return_read_connection(conn)
     
     # ============================================
     # Asset Operations (legacy)
@@ -138,42 +742,94 @@ class DatabaseQueries:
                            contract_address: Optional[str] = None,
                            decimals: int = 18) -> int:
         """Get asset ID, create if doesn't exist"""
-        conn = self.db.get_connection()
+        cache_key = ('asset', symbol, contract_address)
+        cached = self._id_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        conn = self._get_connection()
         try:
             with conn.cursor() as cur:
-                if contract_address is None:
-                    cur.execute(
-                        """SELECT asset_id FROM assets
-                           WHERE symbol = %s AND contract_address IS NULL""",
-                        (symbol,)
-                    )
-                else:
-                    cur.execute(
-                        """SELECT asset_id FROM assets
-                           WHERE symbol = %s AND contract_address = %s""",
-                        (symbol, contract_address)
-                    )
-                result = cur.fetchone()
-                
-                if result:
-                    return result[0]
-                
                 cur.execute(
-                    """INSERT INTO assets (symbol, name, contract_address, decimals)
-                       VALUES (%s, %s, %s, %s)
-                       RETURNING asset_id""",
+                    _UPSERT_ASSET_SQL,
                     (symbol, name, contract_address, decimals)
                 )
-                asset_id = cur.fetchone()[0]
-                conn.commit()
-                logger.info(f"Created asset: {symbol} (ID: {asset_id})")
+                asset_id, inserted = cur.fetchone()
+                self._commit(conn)
+                if inserted:
+                    logger.info(f"Created asset: {symbol} (ID: {asset_id})")
+                self._id_cache[cache_key] = asset_id
                 return asset_id
         except Exception as e:
-            conn.rollback()
+            self._rollback(conn)
             logger.error(f"Error getting/creating asset {symbol}: {e}")
             raise
         finally:
-            self.db.return_connection(conn)
+            self._return_connection(conn)
+    
+    def resolve_asset_ids(self, symbols: List[str],
+                          names: Optional[Dict[str, str]] = None) -> Dict[str, int]:
+        """Get or create many contract-less assets in at most two round-trips.
+
+        Looks up every uncached symbol with one ANY() query, then creates the
+        missing ones with one UNNEST upsert. Results land in the ID cache, so
+        later get_or_create_asset(symbol) calls are free.
+
+        Args:
+            symbols: Asset symbols (assets with no contract address)
+            names: Optional display name per symbol for newly created assets
+
+        Returns:
+            Dict mapping symbol -> asset_id
+        """
+        names = names or {}
+        resolved = {}
+        pending = []
+        for symbol in dict.fromkeys(symbols):
+            cached = self._id_cache.get(('asset', symbol, None))
+            if cached is not None:
+                resolved[symbol] = cached
+            else:
+                pending.append(symbol)
+
+        if not pending:
+            return resolved
+
+        conn = self._get_connection()
+        try:
+            with conn.cursor() as cur:
+                cur.execute(
+                    """SELECT symbol, asset_id FROM assets
+                       WHERE symbol = ANY(%s) AND contract_address IS NULL""",
+                    (pending,)
+                )
+                found = dict(cur.fetchall())
+
+                missing = [symbol for symbol in pending if symbol not in found]
+                if missing:
+                    cur.execute(
+                        f"""INSERT INTO assets (symbol, name)
+                           SELECT * FROM UNNEST(%s::text[], %s::text[])
+                           ON CONFLICT {_ASSET_CONFLICT_TARGET}
+                           DO UPDATE SET symbol = EXCLUDED.symbol
+                           RETURNING symbol, asset_id""",
+                        (missing, [names.get(symbol) for symbol in missing])
+                    )
+                    created = dict(cur.fetchall())
+                    self._commit(conn)
+                    logger.info(f"Created {len(created)} assets: {', '.join(created)}")
+                    found.update(created)
+
+            for symbol, asset_id in found.items():
+                self._id_cache[('asset', symbol, None)] = asset_id
+            resolved.update(found)
+            return resolved
+        except Exception as e:
+            self._rollback(conn)
+            logger.error(f"Error resolving asset IDs: {e}")
+            raise
+        finally:
+            self._return_connection(conn)
     
     # ============================================
     # APR Snapshot Operations (legacy)
@@ -206,34 +862,177 @@ class DatabaseQueries:
             farm_apr: Farm/yield farming rewards APR component (token emissions)
             swap_fee_percent: Swap/trading fee percentage (e.g., 0.30 for 0.30%)
         """
-        if timestamp is None:
-            timestamp = datetime.utcnow()
-        
-        conn = self.db.get_connection()
+        return self.insert_apr_snapshots_bulk([{
+            'blockchain_id': blockchain_id,
+            'protocol_id': protocol_id,
+            'asset_id': asset_id,
+            'apr': apr,
+            'timestamp': timestamp,
+            'yield_type': yield_type,
+            'tvl_usd': tvl_usd,
+            'fees_24h': fees_24h,
+            'volume_24h': volume_24h,
+            'version': version,
+            'apr_1d': apr_1d,
+            'fee_apr': fee_apr,
+            'staking_apr': staking_apr,
+            'farm_apr': farm_apr,
+            'swap_fee_percent': swap_fee_percent,
+        }])[0]
+
+    def insert_apr_snapshots_bulk(self, rows: List[Dict[str, Any]],
+                                  batch_size: int = _MULTI_INSERT_MAX_ROWS) -> List[int]:
+        """Insert many APR snapshots in a single batch and transaction.
+
+        Args:
+            rows: One dict per snapshot, keyed like the insert_apr_snapshot
+                arguments. blockchain_id, protocol_id, asset_id and apr are
+                required; timestamp defaults to now (UTC), yield_type to 'lp'
+                and every other field to NULL.
+            batch_size: Rows per multi-row INSERT statement
+
+        Returns:
+            Snapshot IDs, in the same order as rows
+        """
+        if not rows:
+            return []
+
+        conn = self._get_connection()
+        try:
+            with conn.cursor(binary=True) as cur:
+                params = _apr_snapshot_params(rows)
+                snapshot_ids = _multi_insert_returning(cur, _APR_SNAPSHOT_TARGET, params, "snapshot_id", batch_size)
+                self._commit(conn)
+                return snapshot_ids
+        except Exception as e:
+            self._rollback(conn)
+            logger.error(f"Error inserting APR snapshots: {e}")
+            raise
+        finally:
+            self._return_connection(conn)
+
+    def insert_apr_snapshots_copy(self, rows: List[Dict[str, Any]]) -> int:
+        """Stream APR snapshots into the table with binary COPY.
+
+        Takes the same row dicts as insert_apr_snapshots_bulk but cannot
+        return snapshot IDs; use it for large backfills where they are not
+        needed. Naive timestamps are taken as UTC.
+
+        Returns:
+            Number of rows copied
+        """
+        if not rows:
+            return 0
+
+        conn = self._get_connection()
+        try:
+            with conn.cursor() as cur:
+                with cur.copy("""
+                    COPY apr_snapshots (
+                        blockchain_id, protocol_id, asset_id, apr, timestamp, yield_type,
+                        tvl_usd, fees_24h, volume_24h, version, apr_1d,
+                        fee_apr, staking_apr, farm_apr, swap_fee_percent
+                    ) FROM STDIN WITH (FORMAT BINARY)
+                """) as copy:
+                    copy.set_types([
+                        "int4", "int4", "int4", "numeric", "timestamptz", "text",
+                        "numeric", "numeric", "numeric", "text", "numeric",
+                        "numeric", "numeric", "numeric", "numeric",
+                    ])
+                    params = _apr_snapshot_params(rows)
+                    for row in params:
+                        timestamp = row[4]
+                        if timestamp.tzinfo is None:
+                            row = row[:4] + (timestamp.replace(tzinfo=timezone.utc),) + row[5:]
+                        copy.write_row(row)
+            self._commit(conn)
+            logger.debug(f"Copied {len(rows)} APR snapshots")
+            return len(rows)
+
+        except Exception as e:
+            self._rollback(conn)
+            logger.error(f"Error copying APR snapshots: {e}")
+            raise
+        finally:
+            self._return_connection(conn)
+
+    async def insert_apr_snapshots_bulk_async(self, rows: List[Dict[str, Any]],
+                                              batch_size: int = _MULTI_INSERT_MAX_ROWS) -> List[int]:
+        """Async variant of insert_apr_snapshots_bulk on the asyncio pool.
+
+        Each call checks out its own pooled connection, so independent batches
+        (e.g. one per protocol) can be ingested concurrently with asyncio.gather.
+        """
+        if not rows:
+            return []
+
+        pool = await self.db.get_async_connection_pool()
+        try:
+            async with pool.connection() as conn:
+                async with conn.cursor(binary=True) as cur:
+                    params = _apr_snapshot_params(rows)
+                    snapshot_ids = await _multi_insert_returning_async(
+                        cur, _APR_SNAPSHOT_TARGET, params, "snapshot_id", batch_size
+                    )
+                    return snapshot_ids
+        except Exception as e:
+            logger.error(f"Error inserting APR snapshots: {e}")
+            raise
+    
+    def insert_apr_snapshot_by_name(self, blockchain_name: str, chain_id: int,
+                                    protocol_name: str, asset_symbol: str,
+                                    apr: Decimal,
+                                    contract_address: Optional[str] = None,
+                                    **fields: Any) -> int:
+        """Insert an APR snapshot, resolving blockchain/protocol/asset by name.
+
+        The blockchain and protocol come from the cached get_or_create_*
+        lookups (no round-trip once seen); the asset upsert and the snapshot
+        insert then share one statement.
+
+        Args:
+            blockchain_name: Blockchain name (created with chain_id if missing)
+            chain_id: Chain ID used when the blockchain has to be created
+            protocol_name: Protocol name on that blockchain
+            asset_symbol: Asset symbol (also used as the name of a new asset)
+            apr: APR value
+            contract_address: Asset contract address, if any
+            **fields: Any other insert_apr_snapshot argument (timestamp,
+                yield_type, tvl_usd, ...)
+
+        Returns:
+            Snapshot ID
+        """
+        blockchain_id = self.get_or_create_blockchain(blockchain_name, chain_id)
+        protocol_id = self.get_or_create_protocol(blockchain_id, protocol_name)
+        row = dict(fields, blockchain_id=blockchain_id, protocol_id=protocol_id, asset_id=None, apr=apr)
+        params = _apr_snapshot_params([row])[0]
+
+        conn = self._get_connection()
         try:
             with conn.cursor() as cur:
                 cur.execute(
-                    """INSERT INTO apr_snapshots 
-                       (blockchain_id, protocol_id, asset_id, apr, timestamp, yield_type, tvl_usd, fees_24h, volume_24h, version, apr_1d, fee_apr, staking_apr, farm_apr, swap_fee_percent)
-                       VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                       RETURNING snapshot_id""",
-                    (blockchain_id, protocol_id, asset_id, apr, timestamp, yield_type, tvl_usd, fees_24h, volume_24h, version, apr_1d, fee_apr, staking_apr, farm_apr, swap_fee_percent)
+                    _INSERT_APR_SNAPSHOT_WITH_ASSET_SQL,
+                    (asset_symbol, asset_symbol, contract_address,
+                     blockchain_id, protocol_id) + params[3:]
                 )
-                snapshot_id = cur.fetchone()[0]
-                conn.commit()
+                snapshot_id, asset_id = cur.fetchone()
+                self._commit(conn)
+                self._id_cache[('asset', asset_symbol, contract_address)] = asset_id
                 return snapshot_id
         except Exception as e:
-            conn.rollback()
-            logger.error(f"Error inserting APR snapshot: {e}")
+            self._rollback(conn)
+            logger.error(f"Error inserting APR snapshot for {protocol_name}/{asset_symbol}: {e}")
             raise
         finally:
-            self.db.return_connection(conn)
-    
+            self._return_connection(conn)
+
     def has_snapshots_for_date_est(self, protocol_id: int, date_est: date) -> bool:
-        """Check if any apr_snapshots exist for protocol on given EST date.
+        """Check if apr_snapshots have been collected for protocol on given EST date.
 
-        Converts EST date boundaries to UTC for query since timestamps are stored in UTC.
-        EST midnight = UTC 05:00 (or 04:00 during DST).
+        Answered from protocol_ingest_state (kept up to date by triggers on
+        apr_snapshots) with a primary key lookup when the date is the
+        protocol's latest; otherwise the EST day is scanned in apr_snapshots.
 
         Args:
             protocol_id: The protocol ID to check
@@ -242,32 +1041,24 @@ class DatabaseQueries:
         Returns:
             True if at least one snapshot exists for that date, False otherwise
         """
-        est = ZoneInfo("America/New_York")
-
-        # Create datetime at start of day in EST, then convert to UTC
-        start_of_day_est = datetime(date_est.year, date_est.month, date_est.day, tzinfo=est)
-        end_of_day_est = start_of_day_est + timedelta(days=1)
-
-        # Convert to UTC for database query
-        start_utc = start_of_day_est.astimezone(ZoneInfo("UTC"))
-        end_utc = end_of_day_est.astimezone(ZoneInfo("UTC"))
-
-        conn = self.db.get_connection()
+        conn = self._get_read_connection()
         try:
-            with conn.cursor() as cur:
-                cur.execute(
-                    """SELECT EXISTS(
-                        SELECT 1 FROM apr_snapshots
-                        WHERE protocol_id = %s
-                          AND timestamp >= %s
-                          AND timestamp < %s
-                    )""",
-                    (protocol_id, start_utc, end_utc)
-                )
-                result = cur.fetchone()
-                return result[0] if result else False
+            with conn.cursor(row_factory=scalar_row) as cur:
+                cur.execute(_HAS_PROTOCOL_SNAPSHOTS_SQL, (date_est, protocol_id), prepare=True)
+                return bool(cur.fetchone())
         finally:
-            self.db.return_connection(conn)
+            self._return_read_connection(conn)
+
+    async def has_snapshots_for_date_est_async(self, protocol_id: int, date_est: date) -> bool:
+        """Async variant of has_snapshots_for_date_est on the asyncio pool.
+
+        Lets a scheduler check many protocols concurrently with asyncio.gather.
+        """
+        pool = await self.db.get_async_connection_pool()
+        async with pool.connection() as conn:
+            async with conn.cursor(row_factory=scalar_row) as cur:
+                await cur.execute(_HAS_PROTOCOL_SNAPSHOTS_SQL, (date_est, protocol_id), prepare=True)
+                return bool(await cur.fetchone())
 
     # ============================================
     # Tracked Pools Operations
@@ -281,22 +1072,37 @@ class DatabaseQueries:
 
         Returns:
             List of tracked pool dicts with pool_identifier, pair_name, version
+            (cached for LATEST_CACHE_TTL_SECONDS)
         """
-        conn = self.db.get_connection()
+        cache_key = ('tracked_pools', protocol)
+        hit, cached = self._get_cached_latest(cache_key)
+        if hit:
+            return list(cached)
+
+        conn = self._get_read_connection()
         try:
             with conn.cursor(row_factory=dict_row) as cur:
-                cur.execute(
-                    """SELECT id, pool_identifier, pair_name, version,
-                              first_tracked_date, last_above_threshold_date,
-                              consecutive_days_below
-                       FROM tracked_pools
-                       WHERE protocol = %s AND is_active = TRUE
-                       ORDER BY pair_name""",
-                    (protocol,)
-                )
-                return [dict(row) for row in cur.fetchall()]
+                cur.execute(_ACTIVE_TRACKED_POOLS_SQL, (protocol,))
+                pools = cur.fetchall()
+                self._set_cached_latest(cache_key, pools)
+                return list(pools)
         finally:
-            self.db.return_connection(conn)
+            self._return_read_connection(conn)
+
+    async def get_active_tracked_pools_async(self, protocol: str) -> List[Dict]:
+        """Async variant of get_active_tracked_pools (shares its cache)"""
+        cache_key = ('tracked_pools', protocol)
+        hit, cached = self._get_cached_latest(cache_key)
+        if hit:
+            return list(cached)
+
+        pool = await self.db.get_async_connection_pool()
+        async with pool.connection() as conn:
+            async with conn.cursor(row_factory=dict_row) as cur:
+                await cur.execute(_ACTIVE_TRACKED_POOLS_SQL, (protocol,))
+                pools = await cur.fetchall()
+        self._set_cached_latest(cache_key, pools)
+        return list(pools)
 
     def upsert_tracked_pool(
         self,
@@ -304,7 +1110,8 @@ class DatabaseQueries:
         pool_identifier: str,
         pair_name: str,
         version: Optional[str] = None,
-        above_threshold: bool = True
+        above_threshold: bool = True,
+        today: Optional[date] = None
     ) -> int:
         """Add or update a tracked pool.
 
@@ -317,15 +1124,18 @@ class DatabaseQueries:
             pair_name: Display name (e.g., 'iUSD-ADA')
             version: Pool version (e.g., 'V3')
             above_threshold: Whether pool TVL is currently above threshold
+            today: Date recorded as last_above_threshold_date (defaults to
+                date.today(); pass it once when upserting many pools)
 
         Returns:
             Tracked pool ID
         """
-        conn = self.db.get_connection()
+        if today is None:
+            today = date.today()
+
+        conn = self._get_connection()
         try:
             with conn.cursor() as cur:
-                today = date.today()
-
                 if above_threshold:
                     # Pool is above threshold - reset counter, update last_above date
                     cur.execute(
@@ -360,14 +1170,15 @@ class DatabaseQueries:
                     )
 
                 pool_id = cur.fetchone()[0]
-                conn.commit()
+                self._commit(conn)
+                self._latest_cache.pop(('tracked_pools', protocol), None)
                 return pool_id
         except Exception as e:
-            conn.rollback()
+            self._rollback(conn)
             logger.error(f"Error upserting tracked pool {pair_name}: {e}")
             raise
         finally:
-            self.db.return_connection(conn)
+            self._return_connection(conn)
 
     def deactivate_stale_pools(self, protocol: str, grace_period_days: int = 7) -> int:
         """Deactivate pools that have been below threshold for too long.
@@ -379,7 +1190,7 @@ class DatabaseQueries:
         Returns:
             Number of pools deactivated
         """
-        conn = self.db.get_connection()
+        conn = self._get_connection()
         try:
             with conn.cursor() as cur:
                 cur.execute(
@@ -392,104 +1203,81 @@ class DatabaseQueries:
                     (protocol, grace_period_days)
                 )
                 deactivated = cur.fetchall()
-                conn.commit()
-
-                for pool_id, pair_name in deactivated:
-                    logger.info(f"Deactivated tracked pool {pair_name} (id={pool_id}) after {grace_period_days} days below threshold")
-
-                return len(deactivated)
+                self._commit(conn)
+                self._latest_cache.pop(('tracked_pools', protocol), None)
         except Exception as e:
-            conn.rollback()
+            self._rollback(conn)
             logger.error(f"Error deactivating stale pools: {e}")
             raise
         finally:
-            self.db.return_connection(conn)
+            self._return_connection(conn)
+
+        # Logged after the connection is back in the pool
+        if deactivated:
+            logger.info(
+                "Deactivated %d tracked %s pools after %d days below threshold: %s",
+                len(deactivated), protocol, grace_period_days,
+                ", ".join(pair_name for _, pair_name in deactivated)
+            )
+            logger.debug("Deactivated tracked pool ids: %s", [pool_id for pool_id, _ in deactivated])
+        return len(deactivated)
 
     def get_tracked_pool_ids(self, protocol: str) -> List[str]:
         """Get just the pool identifiers for active tracked pools.
 
+        Derived from get_active_tracked_pools, so a caller that needs both
+        costs one query.
+
         Args:
             protocol: Protocol name
 
         Returns:
             List of pool identifier strings
         """
-        conn = self.db.get_connection()
-        try:
-            with conn.cursor() as cur:
-                cur.execute(
-                    """SELECT pool_identifier
-                       FROM tracked_pools
-                       WHERE protocol = %s AND is_active = TRUE""",
-                    (protocol,)
-                )
-                return [row[0] for row in cur.fetchall()]
-        finally:
-            self.db.return_connection(conn)
+        return [pool['pool_identifier'] for pool in self.get_active_tracked_pools(protocol)]
 
     def get_latest_aprs(self, blockchain_name: Optional[str] = None,
                        protocol_name: Optional[str] = None,
                        asset_symbol: Optional[str] = None) -> List[Dict]:
         """Get latest APR values with optional filters"""
-        conn = self.db.get_connection()
+        filters = (blockchain_name, protocol_name, asset_symbol)
+        query = _LATEST_APR_QUERIES[tuple(bool(value) for value in filters)]
+        params = [value for value in filters if value]
+
+        conn = self._get_read_connection()
         try:
             with conn.cursor(row_factory=dict_row) as cur:
-                query = """
-                    SELECT
-                        b.name AS blockchain,
-                        p.name AS protocol,
-                        a.symbol AS asset,
-                        s.apr,
-                        s.timestamp
-                    FROM apr_snapshots s
-                    JOIN blockchains b ON s.blockchain_id = b.blockchain_id
-                    JOIN protocols p ON s.protocol_id = p.protocol_id
-                    JOIN assets a ON s.asset_id = a.asset_id
-                    WHERE s.timestamp = (
-                        SELECT MAX(timestamp)
-                        FROM apr_snapshots
-                        WHERE blockchain_id = s.blockchain_id
-                          AND protocol_id = s.protocol_id
-                          AND asset_id = s.asset_id
-                    )
-                """
-                
-                conditions = []
-                params = []
-                
-                if blockchain_name:
-                    conditions.append("b.name = %s")
-                    params.append(blockchain_name)
-                
-                if protocol_name:
-                    conditions.append("p.name = %s")
-                    params.append(protocol_name)
-                
-                if asset_symbol:
-                    conditions.append("a.symbol = %s")
-                    params.append(asset_symbol)
-                
-                if conditions:
-                    query += " AND " + " AND ".join(conditions)
-                
-                query += " ORDER BY b.name, p.name, a.symbol"
-                
                 cur.execute(query, params)
-                return [dict(row) for row in cur.fetchall()]
+                return cur.fetchall()
         finally:
-            self.db.return_connection(conn)
+            self._return_read_connection(conn)
 
 
-class APYQueries:
+class APYQueries(_BatchableQueries):
     """Query class for APY-related database operations"""
 
     def __init__(self, db: DatabaseConnection):
         self.db = db
+        # Asset IDs never change once created (see DatabaseQueries._id_cache)
+        self._id_cache: Dict[Tuple, int] = {}
+        # Short-lived results of the get_latest_* lookups: key -> (expires_at, value)
+        self._latest_cache: Dict[Tuple, Tuple[float, Any]] = {}
+        self._batch_local = threading.local()
+
+    def _invalidate_latest_prices(self, snapshots: List[PriceSnapshot]):
+        for symbol, source in {(s.token_symbol, s.source) for s in snapshots}:
+            self._latest_cache.pop(('price', symbol, source), None)
+            self._latest_cache.pop(('price', symbol, None), None)
+
+    def _invalidate_latest_liqwid_apys(self, symbols):
+        for symbol in set(symbols):
+            self._latest_cache.pop(('liqwid', symbol), None)
 
     def has_liqwid_snapshots_for_date_est(self, date_est: date) -> bool:
         """Check if any liqwid_apy_snapshots exist for the given EST date.
 
-        Converts EST date boundaries to UTC for query since timestamps are stored in UTC.
+        The EST day boundaries are computed by the server, matching the
+        idx_liqwid_apy_est_date expression index (migration 032).
 
         Args:
             date_est: The EST date to check for snapshots
@@ -497,31 +1285,20 @@ class APYQueries:
         Returns:
             True if at least one snapshot exists for that date, False otherwise
         """
-        est = ZoneInfo("America/New_York")
-
-        # Create datetime at start of day in EST, then convert to UTC
-        start_of_day_est = datetime(date_est.year, date_est.month, date_est.day, tzinfo=est)
-        end_of_day_est = start_of_day_est + timedelta(days=1)
-
-        # Convert to UTC for database query
-        start_utc = start_of_day_est.astimezone(ZoneInfo("UTC"))
-        end_utc = end_of_day_est.astimezone(ZoneInfo("UTC"))
-
-        conn = self.db.get_connection()
+        conn = self._get_read_connection()
         try:
-            with conn.cursor() as cur:
+            with conn.cursor(row_factory=scalar_row) as cur:
                 cur.execute(
                     """SELECT EXISTS(
                         SELECT 1 FROM liqwid_apy_snapshots
-                        WHERE timestamp >= %s
-                          AND timestamp < %s
+                        WHERE (timestamp AT TIME ZONE 'America/New_York')::date = %s
                     )""",
-                    (start_utc, end_utc)
+                    (date_est,),
+                    prepare=True
                 )
-                result = cur.fetchone()
-                return result[0] if result else False
+                return bool(cur.fetchone())
         finally:
-            self.db.return_connection(conn)
+            self._return_read_connection(conn)
 
     # ============================================
     # Asset operations
@@ -530,43 +1307,31 @@ class APYQueries:
     def get_or_create_asset(self, symbol: str, contract_address: Optional[str] = None,
                             name: Optional[str] = None, decimals: int = 18) -> int:
         """Get asset_id or create new asset if not exists"""
-        conn = self.db.get_connection()
+        cache_key = ('asset', symbol, contract_address)
+        cached = self._id_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        conn = self._get_connection()
         try:
             with conn.cursor() as cur:
-                # Try to find existing asset
-                if contract_address is None:
-                    cur.execute("""
-                        SELECT asset_id FROM assets
-                        WHERE symbol = %s AND contract_address IS NULL
-                    """, (symbol,))
-                else:
-                    cur.execute("""
-                        SELECT asset_id FROM assets
-                        WHERE symbol = %s AND contract_address = %s
-                    """, (symbol, contract_address))
-
-                result = cur.fetchone()
-                if result:
-                    return result[0]
-                
-                # Create new asset
-                cur.execute("""
-                    INSERT INTO assets (symbol, name, contract_address, decimals)
-                    VALUES (%s, %s, %s, %s)
-                    RETURNING asset_id
-                """, (symbol, name or symbol, contract_address, decimals))
-                
-                asset_id = cur.fetchone()[0]
-                conn.commit()
-                logger.info(f"Created new asset: {symbol} (id={asset_id})")
+                cur.execute(
+                    _UPSERT_ASSET_SQL,
+                    (symbol, name or symbol, contract_address, decimals)
+                )
+                asset_id, inserted = cur.fetchone()
+                self._commit(conn)
+                if inserted:
+                    logger.info(f"Created new asset: {symbol} (id={asset_id})")
+                self._id_cache[cache_key] = asset_id
                 return asset_id
                 
         except Exception as e:
-            conn.rollback()
+            self._rollback(conn)
             logger.error(f"Error getting/creating asset {symbol}: {e}")
             raise
         finally:
-            self.db.return_connection(conn)
+            self._return_connection(conn)
     
     # ============================================
     # Price snapshot operations
@@ -574,92 +1339,160 @@ class APYQueries:
     
     def insert_price_snapshot(self, snapshot: PriceSnapshot) -> int:
         """Insert a price snapshot and return its ID"""
-        conn = self.db.get_connection()
+        snapshot_id = self.insert_price_snapshots_bulk([snapshot])[0]
+        logger.debug(f"Inserted price snapshot: {snapshot.token_symbol} (id={snapshot_id})")
+        return snapshot_id
+
+    def insert_price_snapshots_bulk(self, snapshots: List[PriceSnapshot],
+                                    batch_size: int = _MULTI_INSERT_MAX_ROWS) -> List[int]:
+        """Insert many price snapshots in a single batch and transaction.
+
+        Args:
+            snapshots: Snapshots to insert
+            batch_size: Rows per multi-row INSERT statement
+
+        Returns:
+            Snapshot IDs, in the same order as snapshots
+        """
+        if not snapshots:
+            return []
+
+        now = datetime.now(timezone.utc)
+        conn = self._get_connection()
+        try:
+            with conn.cursor(binary=True) as cur:
+                snapshot_ids = _multi_insert_returning(cur, _PRICE_SNAPSHOT_TARGET, [
+                    (
+                        snapshot.token_symbol,
+                        snapshot.token_address,
+                        snapshot.price_usd,
+                        snapshot.quote_token_symbol,
+                        snapshot.quote_token_address,
+                        snapshot.price_in_quote,
+                        snapshot.source,
+                        snapshot.pair_address,
+                        snapshot.reserve_token,
+                        snapshot.reserve_quote,
+                        snapshot.timestamp or now
+                    )
+                    for snapshot in snapshots
+                ], "snapshot_id", batch_size)
+                self._commit(conn)
+                self._invalidate_latest_prices(snapshots)
+                return snapshot_ids
+                
+        except Exception as e:
+            self._rollback(conn)
+            logger.error(f"Error inserting price snapshots: {e}")
+            raise
+        finally:
+            self._return_connection(conn)
+    
+    def insert_price_snapshots_copy(self, snapshots: List[PriceSnapshot]) -> int:
+        """Stream price snapshots into the table with binary COPY.
+
+        Fastest path for large batches (1000+ rows). COPY cannot return the
+        generated snapshot IDs; use insert_price_snapshots_bulk when they are
+        needed. Naive timestamps are taken as UTC, like the rest of the module.
+
+        Returns:
+            Number of rows copied
+        """
+        if not snapshots:
+            return 0
+
+        now = datetime.now(timezone.utc)
+        conn = self._get_connection()
         try:
             with conn.cursor() as cur:
-                cur.execute("""
-                    INSERT INTO price_snapshots (
+                with cur.copy("""
+                    COPY price_snapshots (
                         token_symbol, token_address, price_usd,
                         quote_token_symbol, quote_token_address, price_in_quote,
                         source, pair_address, reserve_token, reserve_quote,
                         timestamp
-                    ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                    RETURNING snapshot_id
-                """, (
-                    snapshot.token_symbol,
-                    snapshot.token_address,
-                    snapshot.price_usd,
-                    snapshot.quote_token_symbol,
-                    snapshot.quote_token_address,
-                    snapshot.price_in_quote,
-                    snapshot.source,
-                    snapshot.pair_address,
-                    snapshot.reserve_token,
-                    snapshot.reserve_quote,
-                    snapshot.timestamp or datetime.utcnow()
-                ))
-                
-                snapshot_id = cur.fetchone()[0]
-                conn.commit()
-                logger.debug(f"Inserted price snapshot: {snapshot.token_symbol} (id={snapshot_id})")
-                return snapshot_id
-                
+                    ) FROM STDIN WITH (FORMAT BINARY)
+                """) as copy:
+                    copy.set_types([
+                        "text", "text", "numeric",
+                        "text", "text", "numeric",
+                        "text", "text", "numeric", "numeric",
+                        "timestamptz",
+                    ])
+                    for snapshot in snapshots:
+                        timestamp = snapshot.timestamp or now
+                        if timestamp.tzinfo is None:
+                            timestamp = timestamp.replace(tzinfo=timezone.utc)
+                        copy.write_row((
+                            snapshot.token_symbol,
+                            snapshot.token_address,
+                            snapshot.price_usd,
+                            snapshot.quote_token_symbol,
+                            snapshot.quote_token_address,
+                            snapshot.price_in_quote,
+                            snapshot.source,
+                            snapshot.pair_address,
+                            snapshot.reserve_token,
+                            snapshot.reserve_quote,
+                            timestamp
+                        ))
+            self._commit(conn)
+            self._invalidate_latest_prices(snapshots)
+            logger.debug(f"Copied {len(snapshots)} price snapshots")
+            return len(snapshots)
+
         except Exception as e:
-            conn.rollback()
-            logger.error(f"Error inserting price snapshot: {e}")
+            self._rollback(conn)
+            logger.error(f"Error copying price snapshots: {e}")
             raise
         finally:
-            self.db.return_connection(conn)
+            self._return_connection(conn)
     
     def get_latest_price(self, token_symbol: str, source: Optional[str] = None) -> Optional[PriceSnapshot]:
-        """Get the latest price for a token"""
-        conn = self.db.get_connection()
+        """Get the latest price for a token (cached for LATEST_CACHE_TTL_SECONDS)"""
+        # '' means any source, same as None; normalize first so both share a
+        # cache entry and _invalidate_latest_prices clears it
+        source = source or None
+        cache_key = ('price', token_symbol, source)
+        hit, cached = self._get_cached_latest(cache_key)
+        if hit:
+            return cached
+
+        conn = self._get_read_connection()
         try:
-            with conn.cursor() as cur:
-                if source:
-                    cur.execute("""
-                        SELECT snapshot_id, token_symbol, token_address, price_usd,
-                               quote_token_symbol, quote_token_address, price_in_quote,
-                               source, pair_address, reserve_token, reserve_quote, timestamp
-                        FROM price_snapshots
-                        WHERE token_symbol = %s AND source = %s
-                        ORDER BY timestamp DESC
-                        LIMIT 1
-                    """, (token_symbol, source))
-                else:
-                    cur.execute("""
-                        SELECT snapshot_id, token_symbol, token_address, price_usd,
-                               quote_token_symbol, quote_token_address, price_in_quote,
-                               source, pair_address, reserve_token, reserve_quote, timestamp
-                        FROM price_snapshots
-                        WHERE token_symbol = %s
-                        ORDER BY timestamp DESC
-                        LIMIT 1
-                    """, (token_symbol,))
+            with conn.cursor(binary=True, row_factory=class_row(PriceSnapshot)) as cur:
+                cur.execute(_LATEST_PRICE_SQL, (token_symbol, source, source))
                 
-                row = cur.fetchone()
-                if row:
-                    return PriceSnapshot(
-                        snapshot_id=row[0],
-                        token_symbol=row[1],
-                        token_address=row[2],
-                        price_usd=row[3],
-                        quote_token_symbol=row[4],
-                        quote_token_address=row[5],
-                        price_in_quote=row[6],
-                        source=row[7],
-                        pair_address=row[8],
-                        reserve_token=row[9],
-                        reserve_quote=row[10],
-                        timestamp=row[11]
-                    )
-                return None
+                price = cur.fetchone()
+                self._set_cached_latest(cache_key, price)
+                return price
                 
         except Exception as e:
             logger.error(f"Error getting latest price for {token_symbol}: {e}")
             raise
         finally:
-            self.db.return_connection(conn)
+            self._return_read_connection(conn)
+
+    async def get_latest_price_async(self, token_symbol: str,
+                                     source: Optional[str] = None) -> Optional[PriceSnapshot]:
+        """Async variant of get_latest_price (shares its cache)"""
+        source = source or None
+        cache_key = ('price', token_symbol, source)
+        hit, cached = self._get_cached_latest(cache_key)
+        if hit:
+            return cached
+
+        pool = await self.db.get_async_connection_pool()
+        try:
+            async with pool.connection() as conn:
+                async with conn.cursor(binary=True, row_factory=class_row(PriceSnapshot)) as cur:
+                    await cur.execute(_LATEST_PRICE_SQL, (token_symbol, source, source))
+                    price = await cur.fetchone()
+        except Exception as e:
+            logger.error(f"Error getting latest price for {token_symbol}: {e}")
+            raise
+        self._set_cached_latest(cache_key, price)
+        return price
     
     # ============================================
     # Liqwid APY snapshot operations
@@ -667,171 +1500,257 @@ class APYQueries:
     
     def insert_liqwid_apy_snapshot(self, snapshot: LiqwidAPYSnapshot) -> int:
         """Insert a Liqwid APY snapshot and return its ID"""
-        conn = self.db.get_connection()
+        snapshot_id = self.insert_liqwid_apy_snapshots_bulk([snapshot])[0]
+        logger.info(f"Inserted Liqwid APY snapshot for asset {snapshot.asset_symbol} (id={snapshot_id})")
+        return snapshot_id
+
+    def insert_liqwid_apy_snapshots_bulk(self, snapshots: List[LiqwidAPYSnapshot],
+                                         batch_size: int = _MULTI_INSERT_MAX_ROWS) -> List[int]:
+        """Insert many Liqwid APY snapshots in a single batch and transaction.
+
+        Args:
+            snapshots: Snapshots to insert
+            batch_size: Rows per multi-row INSERT statement
+
+        Returns:
+            Snapshot IDs, in the same order as snapshots
+        """
+        if not snapshots:
+            return []
+
+        now = datetime.now(timezone.utc)
+        conn = self._get_connection()
+        try:
+            with conn.cursor(binary=True) as cur:
+                snapshot_ids = _multi_insert_returning(
+                    cur, _LIQWID_SNAPSHOT_TARGET,
+                    [_liqwid_snapshot_params(snapshot, now) for snapshot in snapshots],
+                    "snapshot_id", batch_size
+                )
+                self._commit(conn)
+                self._invalidate_latest_liqwid_apys(s.asset_symbol for s in snapshots)
+                return snapshot_ids
+                
+        except Exception as e:
+            self._rollback(conn)
+            logger.error(f"Error inserting Liqwid APY snapshots: {e}")
+            raise
+        finally:
+            self._return_connection(conn)
+
+    def insert_liqwid_apy_snapshots_copy(self, snapshots: List[LiqwidAPYSnapshot]) -> int:
+        """Stream Liqwid APY snapshots into the table with binary COPY.
+
+        COPY cannot return snapshot IDs and, unlike an INSERT, aborts the
+        whole batch if any row repeats an existing (asset_id, market_id,
+        timestamp); use insert_liqwid_apy_snapshots_bulk when either matters.
+
+        Returns:
+            Number of rows copied
+        """
+        if not snapshots:
+            return 0
+
+        now = datetime.now(timezone.utc)
+        conn = self._get_connection()
         try:
             with conn.cursor() as cur:
-                cur.execute("""
+                with cur.copy("""
+                    COPY liqwid_apy_snapshots (
+                        asset_id, market_id, supply_apy, lq_supply_apy, total_supply_apy,
+                        borrow_apy, total_supply, total_borrows, utilization_rate,
+                        available_liquidity, total_supply_usd, total_borrows_usd,
+                        token_price_usd, yield_type, timestamp
+                    ) FROM STDIN WITH (FORMAT BINARY)
+                """) as copy:
+                    copy.set_types([
+                        "int4", "text", "numeric", "numeric", "numeric",
+                        "numeric", "numeric", "numeric", "numeric",
+                        "numeric", "numeric", "numeric",
+                        "numeric", "text", "timestamptz",
+                    ])
+                    for snapshot in snapshots:
+                        params = _liqwid_snapshot_params(snapshot, now)
+                        timestamp = params[-1]
+                        if timestamp.tzinfo is None:
+                            params = params[:-1] + (timestamp.replace(tzinfo=timezone.utc),)
+                        copy.write_row(params)
+            self._commit(conn)
+            self._invalidate_latest_liqwid_apys(s.asset_symbol for s in snapshots)
+            logger.debug(f"Copied {len(snapshots)} Liqwid APY snapshots")
+            return len(snapshots)
+
+        except Exception as e:
+            self._rollback(conn)
+            logger.error(f"Error copying Liqwid APY snapshots: {e}")
+            raise
+        finally:
+            self._return_connection(conn)
+
+    def ingest_liqwid_apy_snapshot(self, snapshot: LiqwidAPYSnapshot,
+                                   asset_name: Optional[str] = None,
+                                   decimals: int = 18) -> int:
+        """Resolve the snapshot's asset by symbol and insert it in one round-trip.
+
+        The asset upsert and the snapshot INSERT are sent together in pipeline
+        mode; the INSERT picks up the asset_id with a subquery, so it does not
+        have to wait for the upsert's result. snapshot.asset_id is ignored.
+
+        Returns:
+            Snapshot ID
+        """
+        symbol = snapshot.asset_symbol
+        conn = self._get_connection()
+        try:
+            with conn.pipeline():
+                asset_cur = conn.execute(
+                    _UPSERT_ASSET_SQL,
+                    (symbol, asset_name or symbol, None, decimals)
+                )
+                snapshot_cur = conn.execute("""
                     INSERT INTO liqwid_apy_snapshots (
                         asset_id, market_id, supply_apy, lq_supply_apy, total_supply_apy,
                         borrow_apy, total_supply, total_borrows, utilization_rate,
                         available_liquidity, total_supply_usd, total_borrows_usd,
                         token_price_usd, yield_type, timestamp
-                    ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+                    ) VALUES (
+                        (SELECT asset_id FROM assets WHERE symbol = %s AND contract_address IS NULL),
+                        %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s
+                    )
                     RETURNING snapshot_id
-                """, (
-                    snapshot.asset_id,
-                    snapshot.market_id,
-                    snapshot.supply_apy,
-                    snapshot.lq_supply_apy,
-                    snapshot.total_supply_apy,
-                    snapshot.borrow_apy,
-                    snapshot.total_supply,
-                    snapshot.total_borrows,
-                    snapshot.utilization_rate,
-                    snapshot.available_liquidity,
-                    snapshot.total_supply_usd,
-                    snapshot.total_borrows_usd,
-                    snapshot.token_price_usd,
-                    snapshot.yield_type or 'supply',
-                    snapshot.timestamp or datetime.utcnow()
-                ))
-                
-                snapshot_id = cur.fetchone()[0]
-                conn.commit()
-                logger.info(f"Inserted Liqwid APY snapshot for asset {snapshot.asset_symbol} (id={snapshot_id})")
-                return snapshot_id
-                
+                """, (symbol,) + _liqwid_snapshot_params(snapshot, datetime.now(timezone.utc))[1:])
+
+            asset_id, inserted = asset_cur.fetchone()
+            snapshot_id = snapshot_cur.fetchone()[0]
+            self._commit(conn)
+            self._invalidate_latest_liqwid_apys([symbol])
+
+            if inserted:
+                logger.info(f"Created new asset: {symbol} (id={asset_id})")
+            self._id_cache[('asset', symbol, None)] = asset_id
+            return snapshot_id
+
         except Exception as e:
-            conn.rollback()
-            logger.error(f"Error inserting Liqwid APY snapshot: {e}")
+            self._rollback(conn)
+            logger.error(f"Error ingesting Liqwid APY snapshot for {symbol}: {e}")
             raise
         finally:
-            self.db.return_connection(conn)
+            self._return_connection(conn)
+    
+    def refresh_latest_liqwid_apys(self):
+        """Refresh the latest_liqwid_apys materialized view after new snapshots"""
+        conn = self._get_connection()
+        try:
+            conn.execute("REFRESH MATERIALIZED VIEW CONCURRENTLY latest_liqwid_apys")
+            self._commit(conn)
+        except Exception as e:
+            self._rollback(conn)
+            logger.error(f"Error refreshing latest_liqwid_apys: {e}")
+            raise
+        finally:
+            self._return_connection(conn)
     
     def get_latest_liqwid_apy(self, asset_symbol: str) -> Optional[LiqwidAPYSnapshot]:
-        """Get the latest Liqwid APY snapshot for an asset"""
-        conn = self.db.get_connection()
+        """Get the latest Liqwid APY snapshot for an asset (cached for LATEST_CACHE_TTL_SECONDS)"""
+        cache_key = ('liqwid', asset_symbol)
+        hit, cached = self._get_cached_latest(cache_key)
+        if hit:
+            return cached
+
+        conn = self._get_read_connection()
         try:
-            with conn.cursor() as cur:
-                cur.execute("""
-                    SELECT l.snapshot_id, l.asset_id, a.symbol, l.market_id,
-                           l.supply_apy, l.lq_supply_apy, l.total_supply_apy, l.borrow_apy,
-                           l.total_supply, l.total_borrows, l.utilization_rate,
-                           l.available_liquidity, l.yield_type, l.timestamp
-                    FROM liqwid_apy_snapshots l
-                    JOIN assets a ON l.asset_id = a.asset_id
-                    WHERE a.symbol = %s
-                    ORDER BY l.timestamp DESC
-                    LIMIT 1
-                """, (asset_symbol,))
+            with conn.cursor(binary=True, row_factory=class_row(LiqwidAPYSnapshot)) as cur:
+                cur.execute(_LATEST_LIQWID_APY_SQL, (asset_symbol,))
                 
-                row = cur.fetchone()
-                if row:
-                    return LiqwidAPYSnapshot(
-                        snapshot_id=row[0],
-                        asset_id=row[1],
-                        asset_symbol=row[2],
-                        market_id=row[3],
-                        supply_apy=row[4],
-                        lq_supply_apy=row[5],
-                        total_supply_apy=row[6],
-                        borrow_apy=row[7],
-                        total_supply=row[8],
-                        total_borrows=row[9],
-                        utilization_rate=row[10],
-                        available_liquidity=row[11],
-                        yield_type=row[12],
-                        timestamp=row[13]
-                    )
-                return None
+                snapshot = cur.fetchone()
+                self._set_cached_latest(cache_key, snapshot)
+                return snapshot
                 
         except Exception as e:
             logger.error(f"Error getting latest Liqwid APY for {asset_symbol}: {e}")
             raise
         finally:
-            self.db.return_connection(conn)
+            self._return_read_connection(conn)
     
-    def get_liqwid_apy_history(self, asset_symbol: str, days: int = 30) -> List[LiqwidAPYSnapshot]:
-        """Get Liqwid APY history for an asset"""
-        conn = self.db.get_connection()
+    def get_liqwid_apy_history(self, asset_symbol: str, days: int = 30,
+                               columns: Optional[Tuple[str, ...]] = None) -> List[LiqwidAPYSnapshot]:
+        """Get Liqwid APY history for an asset
+
+        Results are requested in binary format so the many NUMERIC columns are
+        decoded by psycopg's C loaders instead of parsed from text.
+
+        Args:
+            asset_symbol: Asset symbol
+            days: How many days back to fetch
+            columns: Optional subset of LiqwidAPYSnapshot fields to load (e.g.
+                ('timestamp', 'supply_apy')); the rest are left at their
+                defaults. asset_id and asset_symbol are always loaded.
+        """
+        query = _liqwid_history_query(tuple(columns) if columns is not None else None)
+
+        conn = self._get_read_connection()
         try:
-            with conn.cursor() as cur:
-                cur.execute("""
-                    SELECT l.snapshot_id, l.asset_id, a.symbol, l.market_id,
-                           l.supply_apy, l.lq_supply_apy, l.total_supply_apy, l.borrow_apy,
-                           l.total_supply, l.total_borrows, l.utilization_rate,
-                           l.available_liquidity, l.yield_type, l.timestamp
-                    FROM liqwid_apy_snapshots l
-                    JOIN assets a ON l.asset_id = a.asset_id
-                    WHERE a.symbol = %s
-                      AND l.timestamp >= NOW() - INTERVAL '%s days'
-                    ORDER BY l.timestamp DESC
-                """, (asset_symbol, days))
+            with conn.cursor(binary=True, row_factory=class_row(LiqwidAPYSnapshot)) as cur:
+                cur.execute(query, (asset_symbol, days))
                 
-                results = []
-                for row in cur.fetchall():
-                    results.append(LiqwidAPYSnapshot(
-                        snapshot_id=row[0],
-                        asset_id=row[1],
-                        asset_symbol=row[2],
-                        market_id=row[3],
-                        supply_apy=row[4],
-                        lq_supply_apy=row[5],
-                        total_supply_apy=row[6],
-                        borrow_apy=row[7],
-                        total_supply=row[8],
-                        total_borrows=row[9],
-                        utilization_rate=row[10],
-                        available_liquidity=row[11],
-                        yield_type=row[12],
-                        timestamp=row[13]
-                    ))
-                return results
+                return cur.fetchall()
                 
         except Exception as e:
             logger.error(f"Error getting Liqwid APY history for {asset_symbol}: {e}")
             raise
         finally:
-            self.db.return_connection(conn)
+            self._return_read_connection(conn)
+
+    def iter_liqwid_apy_history(self, asset_symbol: str, days: int = 30,
+                                columns: Optional[Tuple[str, ...]] = None,
+                                itersize: int = 2000) -> Iterator[LiqwidAPYSnapshot]:
+        """Stream Liqwid APY history through a server-side cursor.
+
+        Same rows as get_liqwid_apy_history, but only itersize rows are held
+        in memory at a time, for long histories consumed incrementally. The
+        connection stays checked out until the generator is exhausted or
+        closed, so consume it promptly (or close it, e.g. with
+        contextlib.closing).
+
+        Args:
+            asset_symbol: Asset symbol
+            days: How many days back to fetch
+            columns: Optional subset of LiqwidAPYSnapshot fields to load
+            itersize: Rows fetched from the server per round-trip
+        """
+        query = _liqwid_history_query(tuple(columns) if columns is not None else None)
+
+        conn = self._get_connection()
+        try:
+            with conn.cursor(name=f"liqwid_history_{uuid.uuid4().hex}", binary=True,
+                             row_factory=class_row(LiqwidAPYSnapshot)) as cur:
+                cur.itersize = itersize
+                cur.execute(query, (asset_symbol, days))
+                yield from cur
+            # Read-only: end the transaction that held the cursor open
+            self._rollback(conn)
+        except Exception as e:
+            self._rollback(conn)
+            logger.error(f"Error streaming Liqwid APY history for {asset_symbol}: {e}")
+            raise
+        finally:
+            self._return_connection(conn)
     
     def get_all_latest_liqwid_apys(self) -> List[LiqwidAPYSnapshot]:
-        """Get the latest Liqwid APY snapshot for all markets"""
-        conn = self.db.get_connection()
+        """Get the latest Liqwid APY snapshot for all markets.
+
+        Reads the latest_liqwid_apys materialized view (one row per asset),
+        which is as fresh as the last refresh_latest_liqwid_apys() call.
+        """
+        conn = self._get_read_connection()
         try:
-            with conn.cursor() as cur:
-                cur.execute("""
-                    SELECT DISTINCT ON (a.symbol)
-                           l.snapshot_id, l.asset_id, a.symbol, l.market_id,
-                           l.supply_apy, l.lq_supply_apy, l.total_supply_apy, l.borrow_apy,
-                           l.total_supply, l.total_borrows, l.utilization_rate,
-                           l.available_liquidity, l.yield_type, l.timestamp
-                    FROM liqwid_apy_snapshots l
-                    JOIN assets a ON l.asset_id = a.asset_id
-                    ORDER BY a.symbol, l.timestamp DESC
-                """)
+            with conn.cursor(binary=True, row_factory=class_row(LiqwidAPYSnapshot)) as cur:
+                cur.execute(_ALL_LATEST_LIQWID_APYS_SQL)
                 
-                results = []
-                for row in cur.fetchall():
-                    results.append(LiqwidAPYSnapshot(
-                        snapshot_id=row[0],
-                        asset_id=row[1],
-                        asset_symbol=row[2],
-                        market_id=row[3],
-                        supply_apy=row[4],
-                        lq_supply_apy=row[5],
-                        total_supply_apy=row[6],
-                        borrow_apy=row[7],
-                        total_supply=row[8],
-                        total_borrows=row[9],
-                        utilization_rate=row[10],
-                        available_liquidity=row[11],
-                        yield_type=row[12],
-                        timestamp=row[13]
-                    ))
-                return results
+                return cur.fetchall()
                 
         except Exception as e:
             logger.error(f"Error getting all latest Liqwid APYs: {e}")
             raise
         finally:
-            self.db.return_connection(conn)
+            self._return_read_connection(conn)
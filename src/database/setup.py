@@ -2,6 +2,7 @@
 import psycopg
 from psycopg import sql
 from pathlib import Path
+import sqlparse
 import yaml
 import logging
 from src.database.connection import DatabaseConnection
@@ -18,25 +19,30 @@ def run_migration_file(conn, migration_file: Path):
     with open(migration_file, 'r') as f:
         sql_content = f.read()
     
-    # Split by semicolons and execute each statement
-    # Skip comments and empty statements
+    # sqlparse splits on statement boundaries, so semicolons inside DO $$ ... $$
+    # blocks, function bodies and string literals are left alone.
+    # Skip chunks that are only comments
     statements = [
-        stmt.strip() 
-        for stmt in sql_content.split(';') 
-        if stmt.strip() and not stmt.strip().startswith('--')
+        stmt
+        for stmt in sqlparse.split(sql_content)
+        if sqlparse.format(stmt, strip_comments=True).strip()
     ]
     
     with conn.cursor() as cur:
         for statement in statements:
-            if statement:
-                try:
-                    cur.execute(statement)
-                except Exception as e:
-                    # Some statements might fail if already executed (like CREATE EXTENSION)
-                    if "already exists" in str(e).lower() or "duplicate" in str(e).lower():
-                        logger.warning(f"Statement already executed (skipping): {e}")
-                    else:
-                        raise
+            # A failed statement aborts the whole transaction in Postgres, so run
+            # each one under a savepoint that can be rolled back on "already exists"
+            cur.execute("SAVEPOINT migration_statement")
+            try:
+                cur.execute(statement)
+            except Exception as e:
+                # Some statements might fail if already executed (like CREATE EXTENSION)
+                if "already exists" in str(e).lower() or "duplicate" in str(e).lower():
+                    cur.execute("ROLLBACK TO SAVEPOINT migration_statement")
+                    logger.warning(f"Statement already executed (skipping): {e}")
+                else:
+                    raise
+            cur.execute("RELEASE SAVEPOINT migration_statement")
         conn.commit()
     logger.info(f"Migration {migration_file.name} completed")
 
@@ -94,30 +100,31 @@ def initialize_from_config():
     
     chains_config = config.get('chains', {})
     
-    for chain_name, chain_config in chains_config.items():
-        if not chain_config.get('enabled', False):
-            continue
-        
-        # Create blockchain
-        blockchain_id = queries.get_or_create_blockchain(
-            name=chain_name,
-            chain_id=chain_config.get('chain_id'),
-            rpc_url=chain_config.get('rpc_url')
-        )
-        
-        # Create protocols
-        protocols_config = chain_config.get('protocols', {})
-        for protocol_name, protocol_config in protocols_config.items():
-            if not protocol_config.get('enabled', False):
-                continue
-            
-            queries.get_or_create_protocol(
-                blockchain_id=blockchain_id,
-                name=protocol_name,
-                api_url=protocol_config.get('api_url')
-            )
-        
-        logger.info(f"Initialized chain: {chain_name} with {len(protocols_config)} protocols")
+    enabled_chains = {
+        chain_name: chain_config
+        for chain_name, chain_config in chains_config.items()
+        if chain_config.get('enabled', False)
+    }
+    blockchains = [
+        (chain_name, chain_config.get('chain_id'), chain_config.get('rpc_url'))
+        for chain_name, chain_config in enabled_chains.items()
+    ]
+    protocols = [
+        (chain_name, protocol_name, protocol_config.get('api_url'))
+        for chain_name, chain_config in enabled_chains.items()
+        for protocol_name, protocol_config in chain_config.get('protocols', {}).items()
+        if protocol_config.get('enabled', False)
+    ]
+    
+    # Both entity types in one statement (and one round-trip)
+    blockchains_created, protocols_created = queries.get_or_create_blockchains_and_protocols(
+        blockchains, protocols
+    )
+    
+    logger.info(
+        f"Initialized {len(blockchains)} chains with {len(protocols)} protocols "
+        f"({blockchains_created} chains and {protocols_created} protocols created)"
+    )
 
 
 def verify_setup():
@@ -149,7 +156,22 @@ def verify_setup():
                 return False
             
             logger.info(f"All required tables exist: {tables}")
-            
+
+            # Check the time-range BRIN indexes (migrations 030 and 034)
+            cur.execute("""
+                SELECT indexname, pg_size_pretty(pg_relation_size(format('%I.%I', schemaname, indexname)::regclass))
+                FROM pg_indexes
+                WHERE schemaname = 'public'
+                AND indexname IN ('idx_apr_snapshots_timestamp_brin', 'idx_liqwid_apy_timestamp_brin')
+            """)
+            brin_indexes = dict(cur.fetchall())
+
+            for index_name in ('idx_apr_snapshots_timestamp_brin', 'idx_liqwid_apy_timestamp_brin'):
+                if index_name in brin_indexes:
+                    logger.info(f"BRIN index {index_name} exists ({brin_indexes[index_name]})")
+                else:
+                    logger.warning(f"BRIN index {index_name} is missing (run migrations 030/034)")
+
             # Check TimescaleDB hypertable (if TimescaleDB is installed)
             try:
                 cur.execute("""
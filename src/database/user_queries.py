@@ -1,18 +1,40 @@
 """Database queries for user accounts and saved charts"""
 from datetime import datetime, timedelta
 from typing import Optional, List, Dict, Any
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 import bcrypt
-import json
+import logging
+import os
+import threading
+import time
+import orjson
+from psycopg.rows import args_row, class_row
 
 from src.database.connection import DatabaseConnection
+from src.database.models import _SLOTS
+
+logger = logging.getLogger(__name__)
 
 
 # Current Terms of Service version - update this when ToS changes
 CURRENT_TOS_VERSION = "1.0"
 
+# bcrypt work factor for new password hashes (default 12, bcrypt's own
+# default). Existing hashes carry their own cost, so changing this only
+# affects new hashes.
+BCRYPT_ROUNDS = int(os.environ.get('BCRYPT_ROUNDS', 12))
+
+# How long get_user_by_id serves a user from memory. Flask-Login loads the
+# user on every authenticated request; writes made through UserQueries in
+# this process invalidate the entry immediately, other worker processes see
+# changes after at most this long.
+USER_CACHE_TTL_SECONDS = 30
+
+# Entries kept before the oldest are evicted
+USER_CACHE_MAX_SIZE = 10_000
+
 
-@dataclass
+@dataclass(**_SLOTS)
 class User:
     """User model"""
     user_id: int
@@ -79,7 +101,7 @@ class User:
         return False
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class SavedChart:
     """Saved chart configuration model"""
     chart_id: int
@@ -103,19 +125,94 @@ class SavedChart:
         }
 
 
+def _json_dumps(value: Any) -> str:
+    """Encode a chart's filters/display_options for a JSONB parameter (orjson, in C)"""
+    return orjson.dumps(value).decode('utf-8')
+
+
+# Consumes the address's wallet challenge and upserts the user only if an
+# unexpired one existed. An existing user gets wallet_type refreshed (never
+# its ToS fields). Returns (user columns..., created). Params:
+# (wallet_address, wallet_address, wallet_type, tos_version, tos_version)
+_REDEEM_WALLET_CHALLENGE_SQL = """
+    WITH challenge AS (
+        DELETE FROM wallet_challenges
+        WHERE wallet_address = %s AND expires_at > NOW()
+        RETURNING nonce
+    )
+    INSERT INTO users (auth_method, wallet_address, wallet_type, tos_version, tos_accepted_at)
+    SELECT 'wallet', %s, %s, %s, CASE WHEN %s::text IS NOT NULL THEN NOW() END
+    WHERE EXISTS (SELECT 1 FROM challenge)
+    ON CONFLICT (wallet_address) DO UPDATE
+        SET wallet_type = COALESCE(EXCLUDED.wallet_type, users.wallet_type)
+    RETURNING user_id, auth_method, email, email_verified, wallet_address, wallet_type, newsletter_subscribed, tos_version, tos_accepted_at, created_at,
+              (xmax = 0) AS created
+"""
+
+
+def _user_with_extra_column(*row) -> tuple:
+    """Row factory for the user columns followed by one extra column
+    (e.g. password_hash), returning (User, extra)"""
+    return User(*row[:-1]), row[-1]
+
+
 class UserQueries:
     """Database queries for user operations"""
+
+    # user_id -> (expires_at, User or None for a known-missing ID), oldest
+    # first. Shared by every instance in the process, since the auth blueprint
+    # and the Flask-Login loader use separate ones
+    _user_cache: Dict[int, tuple] = {}
+    _user_cache_lock = threading.Lock()
     
     def __init__(self, db: DatabaseConnection):
         self.db = db
+
+    def _cache_user(self, user_id: int, user: Optional[User]):
+        with self._user_cache_lock:
+            self._user_cache.pop(user_id, None)
+            self._user_cache[user_id] = (time.monotonic() + USER_CACHE_TTL_SECONDS, user)
+            if len(self._user_cache) > USER_CACHE_MAX_SIZE:
+                del self._user_cache[next(iter(self._user_cache))]
+
+    def _invalidate_user(self, user_id: int):
+        with self._user_cache_lock:
+            self._user_cache.pop(user_id, None)
     
     def hash_password(self, password: str) -> str:
         """Hash a password using bcrypt"""
-        return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+        return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(rounds=BCRYPT_ROUNDS, prefix=b'2b')).decode('utf-8')
     
     def verify_password(self, password: str, password_hash: str) -> bool:
         """Verify a password against its hash"""
         return bcrypt.checkpw(password.encode('utf-8'), password_hash.encode('utf-8'))
+
+    def password_needs_rehash(self, password_hash: str) -> bool:
+        """True if the hash was made with a lower cost than BCRYPT_ROUNDS"""
+        # Modular crypt format: $2b$<cost>$<salt+hash>
+        try:
+            return int(password_hash.split('$')[2]) < BCRYPT_ROUNDS
+        except (IndexError, ValueError):
+            return False
+
+    def update_password_hash(self, user_id: int, password: str) -> bool:
+        """Re-hash a verified password at the current BCRYPT_ROUNDS"""
+        password_hash = self.hash_password(password)
+        conn = self.db.get_connection()
+        try:
+            with conn.cursor() as cur:
+                cur.execute(
+                    "UPDATE users SET password_hash = %s WHERE user_id = %s",
+                    (password_hash, user_id)
+                )
+                conn.commit()
+                return cur.rowcount > 0
+        except Exception as e:
+            conn.rollback()
+            logger.error(f"Error updating password hash: {e}")
+        finally:
+            self.db.return_connection(conn)
+        return False
     
     # ==========================================
     # User CRUD Operations
@@ -129,159 +226,156 @@ class UserQueries:
         tos_version: Optional[str] = None
     ) -> Optional[User]:
         """Create a new user with email/password authentication"""
+        # Stored lowercased so lookups by lower(email) find it
+        email = email.strip().lower()
+        # Hash before checking out a connection: bcrypt takes tens of
+        # milliseconds of CPU and would otherwise pin a pool slot meanwhile
+        password_hash = self.hash_password(password)
         conn = self.db.get_connection()
         try:
-            password_hash = self.hash_password(password)
             # Set tos_accepted_at to NOW() if tos_version is provided
             tos_accepted_at_sql = "NOW()" if tos_version else "NULL"
-            with conn.cursor() as cur:
+            with conn.cursor(row_factory=class_row(User)) as cur:
                 cur.execute(f"""
                     INSERT INTO users (auth_method, email, password_hash, verification_token, tos_version, tos_accepted_at)
                     VALUES ('email', %s, %s, %s, %s, {tos_accepted_at_sql})
                     RETURNING user_id, auth_method, email, email_verified, wallet_address, wallet_type, newsletter_subscribed, tos_version, tos_accepted_at, created_at
                 """, (email, password_hash, verification_token, tos_version))
-                row = cur.fetchone()
+                user = cur.fetchone()
                 conn.commit()
-                if row:
-                    return User(
-                        user_id=row[0],
-                        auth_method=row[1],
-                        email=row[2],
-                        email_verified=row[3],
-                        wallet_address=row[4],
-                        wallet_type=row[5],
-                        newsletter_subscribed=row[6],
-                        tos_version=row[7],
-                        tos_accepted_at=row[8],
-                        created_at=row[9]
-                    )
+                if user:
+                    # Drop a cached miss for the new ID
+                    self._invalidate_user(user.user_id)
+                return user
         except Exception as e:
             conn.rollback()
-            print(f"Error creating email user: {e}")
+            logger.error(f"Error creating email user: {e}")
             raise
         finally:
             self.db.return_connection(conn)
         return None
     
-    def create_wallet_user(
+    def redeem_wallet_challenge(
         self,
         wallet_address: str,
         wallet_type: Optional[str] = None,
         tos_version: Optional[str] = None
-    ) -> Optional[User]:
-        """Create a new user with wallet authentication"""
+    ) -> Optional[tuple]:
+        """Consume the wallet's login challenge and get or create its user.
+
+        The challenge DELETE runs in a CTE and the user is only inserted (or,
+        if it exists, has wallet_type refreshed) when an unexpired challenge
+        was deleted. Two concurrent first logins cannot race on the unique
+        wallet_address.
+
+        Returns:
+            (user, created), or None if there was no valid challenge
+        """
         conn = self.db.get_connection()
         try:
-            # Set tos_accepted_at to NOW() if tos_version is provided
-            tos_accepted_at_sql = "NOW()" if tos_version else "NULL"
-            with conn.cursor() as cur:
-                cur.execute(f"""
-                    INSERT INTO users (auth_method, wallet_address, wallet_type, tos_version, tos_accepted_at)
-                    VALUES ('wallet', %s, %s, %s, {tos_accepted_at_sql})
-                    RETURNING user_id, auth_method, email, email_verified, wallet_address, wallet_type, newsletter_subscribed, tos_version, tos_accepted_at, created_at
-                """, (wallet_address, wallet_type, tos_version))
-                row = cur.fetchone()
+            with conn.cursor(row_factory=args_row(_user_with_extra_column)) as cur:
+                cur.execute(_REDEEM_WALLET_CHALLENGE_SQL,
+                            (wallet_address, wallet_address, wallet_type, tos_version, tos_version),
+                            prepare=True)
+                result = cur.fetchone()
                 conn.commit()
-                if row:
-                    return User(
-                        user_id=row[0],
-                        auth_method=row[1],
-                        email=row[2],
-                        email_verified=row[3],
-                        wallet_address=row[4],
-                        wallet_type=row[5],
-                        newsletter_subscribed=row[6],
-                        tos_version=row[7],
-                        tos_accepted_at=row[8],
-                        created_at=row[9]
-                    )
+                if result:
+                    self._invalidate_user(result[0].user_id)
+                return result
         except Exception as e:
             conn.rollback()
-            print(f"Error creating wallet user: {e}")
+            logger.error(f"Error redeeming wallet challenge: {e}")
             raise
         finally:
             self.db.return_connection(conn)
-        return None
     
     def get_user_by_id(self, user_id: int) -> Optional[User]:
-        """Get user by ID"""
-        conn = self.db.get_connection()
+        """Get user by ID (cached for USER_CACHE_TTL_SECONDS, misses included)"""
+        entry = self._user_cache.get(user_id)
+        if entry is not None and entry[0] > time.monotonic():
+            # Hand out a copy so callers cannot mutate the cached instance
+            return replace(entry[1]) if entry[1] is not None else None
+
+        conn = self.db.get_connection(read_only=True)
         try:
-            with conn.cursor() as cur:
+            with conn.cursor(row_factory=class_row(User)) as cur:
                 cur.execute("""
                     SELECT user_id, auth_method, email, email_verified, wallet_address, wallet_type, newsletter_subscribed, tos_version, tos_accepted_at, created_at
                     FROM users WHERE user_id = %s
-                """, (user_id,))
-                row = cur.fetchone()
-                if row:
-                    return User(
-                        user_id=row[0],
-                        auth_method=row[1],
-                        email=row[2],
-                        email_verified=row[3],
-                        wallet_address=row[4],
-                        wallet_type=row[5],
-                        newsletter_subscribed=row[6],
-                        tos_version=row[7],
-                        tos_accepted_at=row[8],
-                        created_at=row[9]
-                    )
+                """, (user_id,), prepare=True)
+                user = cur.fetchone()
+                # Stale sessions for deleted users keep asking; remember misses too
+                self._cache_user(user_id, user)
+                if user:
+                    return replace(user)
         finally:
             self.db.return_connection(conn)
         return None
     
+    def get_users_by_ids(self, user_ids: List[int]) -> Dict[int, User]:
+        """Get many users by ID in one round-trip.
+
+        Users still in the get_user_by_id cache are served from it; the rest
+        are fetched with a single ANY() query and cached. IDs with no user
+        are left out of the result.
+        """
+        users = {}
+        missing = []
+        now = time.monotonic()
+        for user_id in dict.fromkeys(user_ids):
+            entry = self._user_cache.get(user_id)
+            if entry is not None and entry[0] > now:
+                if entry[1] is not None:
+                    users[user_id] = replace(entry[1])
+            else:
+                missing.append(user_id)
+
+        if not missing:
+            return users
+
+        conn = self.db.get_connection(read_only=True)
+        try:
+            with conn.cursor(row_factory=class_row(User)) as cur:
+                cur.execute("""
+                    SELECT user_id, auth_method, email, email_verified, wallet_address, wallet_type, newsletter_subscribed, tos_version, tos_accepted_at, created_at
+                    FROM users WHERE user_id = ANY(%s)
+                """, (missing,))
+                for user in cur:
+                    self._cache_user(user.user_id, user)
+                    users[user.user_id] = replace(user)
+        finally:
+            self.db.return_connection(conn)
+        for user_id in missing:
+            if user_id not in users:
+                self._cache_user(user_id, None)
+        return users
+    
     def get_user_by_email(self, email: str) -> Optional[tuple]:
         """Get user by email, including password hash for verification"""
-        conn = self.db.get_connection()
+        email = email.strip().lower()
+        conn = self.db.get_connection(read_only=True)
         try:
-            with conn.cursor() as cur:
+            with conn.cursor(row_factory=args_row(_user_with_extra_column)) as cur:
                 cur.execute("""
                     SELECT user_id, auth_method, email, email_verified, wallet_address, wallet_type,
                            newsletter_subscribed, tos_version, tos_accepted_at, created_at, password_hash
-                    FROM users WHERE email = %s
-                """, (email,))
-                row = cur.fetchone()
-                if row:
-                    user = User(
-                        user_id=row[0],
-                        auth_method=row[1],
-                        email=row[2],
-                        email_verified=row[3],
-                        wallet_address=row[4],
-                        wallet_type=row[5],
-                        newsletter_subscribed=row[6],
-                        tos_version=row[7],
-                        tos_accepted_at=row[8],
-                        created_at=row[9]
-                    )
-                    return (user, row[10])  # Return user and password_hash
+                    FROM users WHERE lower(email) = %s
+                """, (email,), prepare=True)
+                return cur.fetchone()
         finally:
             self.db.return_connection(conn)
         return None
     
     def get_user_by_wallet(self, wallet_address: str) -> Optional[User]:
         """Get user by wallet address"""
-        conn = self.db.get_connection()
+        conn = self.db.get_connection(read_only=True)
         try:
-            with conn.cursor() as cur:
+            with conn.cursor(row_factory=class_row(User)) as cur:
                 cur.execute("""
                     SELECT user_id, auth_method, email, email_verified, wallet_address, wallet_type, newsletter_subscribed, tos_version, tos_accepted_at, created_at
                     FROM users WHERE wallet_address = %s
-                """, (wallet_address,))
-                row = cur.fetchone()
-                if row:
-                    return User(
-                        user_id=row[0],
-                        auth_method=row[1],
-                        email=row[2],
-                        email_verified=row[3],
-                        wallet_address=row[4],
-                        wallet_type=row[5],
-                        newsletter_subscribed=row[6],
-                        tos_version=row[7],
-                        tos_accepted_at=row[8],
-                        created_at=row[9]
-                    )
+                """, (wallet_address,), prepare=True)
+                return cur.fetchone()
         finally:
             self.db.return_connection(conn)
         return None
@@ -290,37 +384,28 @@ class UserQueries:
         """Verify user email with token"""
         conn = self.db.get_connection()
         try:
-            with conn.cursor() as cur:
+            with conn.cursor(row_factory=class_row(User)) as cur:
                 cur.execute("""
                     UPDATE users
                     SET email_verified = TRUE, verification_token = NULL
                     WHERE verification_token = %s
                     RETURNING user_id, auth_method, email, email_verified, wallet_address, wallet_type, newsletter_subscribed, tos_version, tos_accepted_at, created_at
                 """, (token,))
-                row = cur.fetchone()
+                user = cur.fetchone()
                 conn.commit()
-                if row:
-                    return User(
-                        user_id=row[0],
-                        auth_method=row[1],
-                        email=row[2],
-                        email_verified=row[3],
-                        wallet_address=row[4],
-                        wallet_type=row[5],
-                        newsletter_subscribed=row[6],
-                        tos_version=row[7],
-                        tos_accepted_at=row[8],
-                        created_at=row[9]
-                    )
+                if user:
+                    self._invalidate_user(user.user_id)
+                return user
         except Exception as e:
             conn.rollback()
-            print(f"Error verifying email: {e}")
+            logger.error(f"Error verifying email: {e}")
         finally:
             self.db.return_connection(conn)
         return None
     
     def set_reset_token(self, email: str, token: str) -> bool:
         """Set password reset token for user"""
+        email = email.strip().lower()
         conn = self.db.get_connection()
         try:
             expires = datetime.utcnow() + timedelta(hours=1)
@@ -328,7 +413,7 @@ class UserQueries:
                 cur.execute("""
                     UPDATE users 
                     SET reset_token = %s, reset_token_expires = %s
-                    WHERE email = %s AND auth_method = 'email'
+                    WHERE lower(email) = %s AND auth_method = 'email'
                     RETURNING user_id
                 """, (token, expires, email))
                 row = cur.fetchone()
@@ -336,41 +421,31 @@ class UserQueries:
                 return row is not None
         except Exception as e:
             conn.rollback()
-            print(f"Error setting reset token: {e}")
+            logger.error(f"Error setting reset token: {e}")
         finally:
             self.db.return_connection(conn)
         return False
     
     def reset_password(self, token: str, new_password: str) -> Optional[User]:
         """Reset password using token"""
+        password_hash = self.hash_password(new_password)
         conn = self.db.get_connection()
         try:
-            password_hash = self.hash_password(new_password)
-            with conn.cursor() as cur:
+            with conn.cursor(row_factory=class_row(User)) as cur:
                 cur.execute("""
                     UPDATE users
                     SET password_hash = %s, reset_token = NULL, reset_token_expires = NULL
                     WHERE reset_token = %s AND reset_token_expires > NOW()
                     RETURNING user_id, auth_method, email, email_verified, wallet_address, wallet_type, newsletter_subscribed, tos_version, tos_accepted_at, created_at
                 """, (password_hash, token))
-                row = cur.fetchone()
+                user = cur.fetchone()
                 conn.commit()
-                if row:
-                    return User(
-                        user_id=row[0],
-                        auth_method=row[1],
-                        email=row[2],
-                        email_verified=row[3],
-                        wallet_address=row[4],
-                        wallet_type=row[5],
-                        newsletter_subscribed=row[6],
-                        tos_version=row[7],
-                        tos_accepted_at=row[8],
-                        created_at=row[9]
-                    )
+                if user:
+                    self._invalidate_user(user.user_id)
+                return user
         except Exception as e:
             conn.rollback()
-            print(f"Error resetting password: {e}")
+            logger.error(f"Error resetting password: {e}")
         finally:
             self.db.return_connection(conn)
         return None
@@ -383,6 +458,7 @@ class UserQueries:
         subscribe_newsletter: bool = False
     ) -> bool:
         """Add email to a wallet-authenticated user"""
+        email = email.strip().lower()
         conn = self.db.get_connection()
         try:
             with conn.cursor() as cur:
@@ -394,10 +470,11 @@ class UserQueries:
                 """, (email, verification_token, subscribe_newsletter, user_id))
                 row = cur.fetchone()
                 conn.commit()
+                self._invalidate_user(user_id)
                 return row is not None
         except Exception as e:
             conn.rollback()
-            print(f"Error adding email to wallet user: {e}")
+            logger.error(f"Error adding email to wallet user: {e}")
         finally:
             self.db.return_connection(conn)
         return False
@@ -414,13 +491,14 @@ class UserQueries:
                     SET newsletter_subscribed = TRUE
                     WHERE user_id = %s
                     RETURNING user_id
-                """, (user_id,))
+                """, (user_id,), prepare=True)
                 row = cur.fetchone()
                 conn.commit()
+                self._invalidate_user(user_id)
                 return row is not None
         except Exception as e:
             conn.rollback()
-            print(f"Error dismissing newsletter prompt: {e}")
+            logger.error(f"Error dismissing newsletter prompt: {e}")
         finally:
             self.db.return_connection(conn)
         return False
@@ -433,13 +511,14 @@ class UserQueries:
                 cur.execute("""
                     UPDATE users SET wallet_type = %s WHERE user_id = %s
                     RETURNING user_id
-                """, (wallet_type, user_id))
+                """, (wallet_type, user_id), prepare=True)
                 row = cur.fetchone()
                 conn.commit()
+                self._invalidate_user(user_id)
                 return row is not None
         except Exception as e:
             conn.rollback()
-            print(f"Error updating wallet type: {e}")
+            logger.error(f"Error updating wallet type: {e}")
         finally:
             self.db.return_connection(conn)
         return False
@@ -454,13 +533,14 @@ class UserQueries:
                     SET tos_version = %s, tos_accepted_at = NOW()
                     WHERE user_id = %s
                     RETURNING user_id
-                """, (tos_version, user_id))
+                """, (tos_version, user_id), prepare=True)
                 row = cur.fetchone()
                 conn.commit()
+                self._invalidate_user(user_id)
                 return row is not None
         except Exception as e:
             conn.rollback()
-            print(f"Error accepting ToS: {e}")
+            logger.error(f"Error accepting ToS: {e}")
         finally:
             self.db.return_connection(conn)
         return False
@@ -474,18 +554,21 @@ class UserQueries:
         conn = self.db.get_connection()
         try:
             with conn.cursor() as cur:
-                # Clean up any existing challenges for this address
-                cur.execute("DELETE FROM wallet_challenges WHERE wallet_address = %s", (wallet_address,))
-                # Create new challenge
+                # One challenge per address (migration 038): a new one
+                # overwrites the previous row
                 cur.execute("""
                     INSERT INTO wallet_challenges (wallet_address, nonce)
                     VALUES (%s, %s)
-                """, (wallet_address, nonce))
+                    ON CONFLICT (wallet_address) DO UPDATE
+                        SET nonce = EXCLUDED.nonce,
+                            created_at = NOW(),
+                            expires_at = NOW() + INTERVAL '5 minutes'
+                """, (wallet_address, nonce), prepare=True)
                 conn.commit()
                 return True
         except Exception as e:
             conn.rollback()
-            print(f"Error creating wallet challenge: {e}")
+            logger.error(f"Error creating wallet challenge: {e}")
         finally:
             self.db.return_connection(conn)
         return False
@@ -499,13 +582,13 @@ class UserQueries:
                     DELETE FROM wallet_challenges 
                     WHERE wallet_address = %s AND expires_at > NOW()
                     RETURNING nonce
-                """, (wallet_address,))
+                """, (wallet_address,), prepare=True)
                 row = cur.fetchone()
                 conn.commit()
                 return row[0] if row else None
         except Exception as e:
             conn.rollback()
-            print(f"Error getting wallet challenge: {e}")
+            logger.error(f"Error getting wallet challenge: {e}")
         finally:
             self.db.return_connection(conn)
         return None
@@ -521,12 +604,40 @@ class UserQueries:
                 return count
         except Exception as e:
             conn.rollback()
-            print(f"Error cleaning up challenges: {e}")
+            logger.error(f"Error cleaning up challenges: {e}")
         finally:
             self.db.return_connection(conn)
         return 0
 
 
+def _update_chart_query(set_name: bool, set_filters: bool, set_display_options: bool) -> str:
+    """update_chart SQL for one combination of updated columns"""
+    columns = [
+        column
+        for column, selected in (('name', set_name), ('filters', set_filters),
+                                 ('display_options', set_display_options))
+        if selected
+    ]
+    return f"""
+        UPDATE saved_charts
+        SET {', '.join(f'{column} = %s' for column in columns)}
+        WHERE chart_id = %s AND user_id = %s
+        RETURNING chart_id, user_id, name, filters, display_options, created_at, updated_at
+    """
+
+
+# update_chart SQL keyed by which of (name, filters, display_options) are
+# set. Built once so each shape always sends the same text and reuses its
+# prepared statement.
+_UPDATE_CHART_QUERIES = {
+    (n, f, d): _update_chart_query(n, f, d)
+    for n in (False, True)
+    for f in (False, True)
+    for d in (False, True)
+    if n or f or d
+}
+
+
 class ChartQueries:
     """Database queries for saved chart operations"""
     
@@ -548,7 +659,7 @@ class ChartQueries:
                     INSERT INTO saved_charts (user_id, name, filters, display_options)
                     VALUES (%s, %s, %s, %s)
                     RETURNING chart_id, user_id, name, filters, display_options, created_at, updated_at
-                """, (user_id, name, json.dumps(filters), json.dumps(display_options) if display_options else None))
+                """, (user_id, name, _json_dumps(filters), _json_dumps(display_options) if display_options else None))
                 row = cur.fetchone()
                 conn.commit()
                 if row:
@@ -563,14 +674,14 @@ class ChartQueries:
                     )
         except Exception as e:
             conn.rollback()
-            print(f"Error creating chart: {e}")
+            logger.error(f"Error creating chart: {e}")
         finally:
             self.db.return_connection(conn)
         return None
     
     def get_chart_by_id(self, chart_id: int) -> Optional[SavedChart]:
         """Get a chart by ID"""
-        conn = self.db.get_connection()
+        conn = self.db.get_connection(read_only=True)
         try:
             with conn.cursor() as cur:
                 cur.execute("""
@@ -594,29 +705,18 @@ class ChartQueries:
     
     def get_user_charts(self, user_id: int) -> List[SavedChart]:
         """Get all charts for a user"""
-        conn = self.db.get_connection()
-        charts = []
+        conn = self.db.get_connection(read_only=True)
         try:
-            with conn.cursor() as cur:
+            with conn.cursor(row_factory=class_row(SavedChart)) as cur:
                 cur.execute("""
                     SELECT chart_id, user_id, name, filters, display_options, created_at, updated_at
                     FROM saved_charts 
                     WHERE user_id = %s
                     ORDER BY updated_at DESC
                 """, (user_id,))
-                for row in cur.fetchall():
-                    charts.append(SavedChart(
-                        chart_id=row[0],
-                        user_id=row[1],
-                        name=row[2],
-                        filters=row[3],
-                        display_options=row[4],
-                        created_at=row[5],
-                        updated_at=row[6]
-                    ))
+                return cur.fetchall()
         finally:
             self.db.return_connection(conn)
-        return charts
     
     def update_chart(
         self,
@@ -629,31 +729,21 @@ class ChartQueries:
         """Update a saved chart (only if owned by user)"""
         conn = self.db.get_connection()
         try:
-            # Build dynamic update query
-            updates = []
+            shape = (name is not None, filters is not None, display_options is not None)
+            if not any(shape):
+                return self.get_chart_by_id(chart_id)
+            
             params = []
             if name is not None:
-                updates.append("name = %s")
                 params.append(name)
             if filters is not None:
-                updates.append("filters = %s")
-                params.append(json.dumps(filters))
+                params.append(_json_dumps(filters))
             if display_options is not None:
-                updates.append("display_options = %s")
-                params.append(json.dumps(display_options))
-            
-            if not updates:
-                return self.get_chart_by_id(chart_id)
-            
+                params.append(_json_dumps(display_options))
             params.extend([chart_id, user_id])
             
             with conn.cursor() as cur:
-                cur.execute(f"""
-                    UPDATE saved_charts 
-                    SET {', '.join(updates)}
-                    WHERE chart_id = %s AND user_id = %s
-                    RETURNING chart_id, user_id, name, filters, display_options, created_at, updated_at
-                """, params)
+                cur.execute(_UPDATE_CHART_QUERIES[shape], params)
                 row = cur.fetchone()
                 conn.commit()
                 if row:
@@ -668,7 +758,7 @@ class ChartQueries:
                     )
         except Exception as e:
             conn.rollback()
-            print(f"Error updating chart: {e}")
+            logger.error(f"Error updating chart: {e}")
         finally:
             self.db.return_connection(conn)
         return None
@@ -688,7 +778,7 @@ class ChartQueries:
                 return row is not None
         except Exception as e:
             conn.rollback()
-            print(f"Error deleting chart: {e}")
+            logger.error(f"Error deleting chart: {e}")
         finally:
             self.db.return_connection(conn)
         return False
@@ -727,12 +817,12 @@ class ChartQueries:
                     cur.execute("""
                         INSERT INTO saved_charts (user_id, name, filters)
                         VALUES (%s, %s, %s)
-                    """, (user_id, chart["name"], json.dumps(chart["filters"])))
+                    """, (user_id, chart["name"], _json_dumps(chart["filters"])))
                 conn.commit()
                 return True
         except Exception as e:
             conn.rollback()
-            print(f"Error creating default charts: {e}")
+            logger.error(f"Error creating default charts: {e}")
         finally:
             self.db.return_connection(conn)
         return False